@@ -0,0 +1,339 @@
+import asyncio
+import time
+
+import pandas as pd
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from stream6 import (
+    RETRY_STATUSES,
+    CoinGlassAPI,
+    DashboardBundle,
+    ResponseCache,
+    available_pairs_frame,
+    decode_frame,
+    decode_rows,
+    get_json_decoder,
+    get_rate_limiter,
+    retry_delay,
+    top_up_limit,
+)
+from timeseries import PairSeries
+
+
+class AsyncSingleFlight:
+    # Coroutines awaiting the same key share one task doing the work
+    def __init__(self):
+        self._calls = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key, coroutine_fn):
+        task = self._calls.get(key)
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(coroutine_fn())
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+        # shield keeps one cancelled caller from cancelling the shared request
+        return await asyncio.shield(task)
+
+    def stats(self):
+        return {
+            "in_flight": len(self._calls),
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+        }
+
+
+class AsyncCoinGlassAPI:
+    DASHBOARD_FETCHES = CoinGlassAPI.DASHBOARD_FETCHES
+
+    # max_concurrency: requests in flight at once across every caller of this client
+    # limit / limit_per_host: size of the shared aiohttp connection pool
+    def __init__(
+        self,
+        api_key,
+        session=None,
+        max_concurrency=50,
+        limit=100,
+        limit_per_host=50,
+        keepalive_timeout=30,
+        cache=None,
+        store=None,
+        requests_per_minute=30,
+        max_retries=4,
+        backoff_base=1.0,
+        backoff_cap=30.0,
+        json_backend="auto",
+        base_url="https://open-api.coinglass.com",
+        store_max_age=None,
+        timeout=30,
+    ):
+        if aiohttp is None:
+            raise ImportError("AsyncCoinGlassAPI requires aiohttp: pip install aiohttp")
+        self.api_key = api_key
+        self.base_url = base_url
+        # Seconds per request, as for CoinGlassAPI
+        self.timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=5)
+        self.headers = {
+            "accept": "application/json",
+            "coinglassSecret": self.api_key,
+        }
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        # A session passed in is shared with other clients and left open on close()
+        self._owns_session = session is None
+        self.session = session
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.cache = cache
+        self.store = store
+        self.store_max_age = store_max_age
+        # Shares the per-key bucket with any blocking CoinGlassAPI in the process
+        self.rate_limiter = (
+            get_rate_limiter(api_key, requests_per_minute)
+            if requests_per_minute
+            else None
+        )
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.json_loads = get_json_decoder(json_backend)
+        self.single_flight = AsyncSingleFlight()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _get_session(self):
+        # Created lazily because aiohttp sessions must be built inside a running loop
+        if self.session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+
+    async def close(self):
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def rate_limit_stats(self):
+        return self.rate_limiter.stats() if self.rate_limiter is not None else {}
+
+    def coalescing_stats(self):
+        return self.single_flight.stats()
+
+    async def _report_error(self, response):
+        print(f"HTTP error occurred: {response.status} {response.reason}")
+        try:
+            error_details = await response.json(content_type=None)
+            print(f"Error details: {error_details}")
+        except ValueError:
+            print("No detailed error message available from API.")
+
+    async def _request(self, endpoint, params=None, refresh=False):
+        if self.cache is not None and not refresh:
+            cached = self.cache.get(endpoint, params)
+            if cached is not None:
+                return cached
+
+        # Identical requests already in flight are joined rather than re-sent
+        return await self.single_flight.do(
+            ResponseCache.make_key(endpoint, params),
+            lambda: self._send(endpoint, params),
+        )
+
+    async def _send(self, endpoint, params):
+        url = f"{self.base_url}{endpoint}"
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                wait = self.rate_limiter.reserve()
+                if wait:
+                    await asyncio.sleep(wait)
+            async with self.semaphore:
+                async with self._get_session().get(
+                    url, headers=self.headers, params=params, timeout=self.timeout
+                ) as response:
+                    retry = (
+                        response.status in RETRY_STATUSES and attempt < self.max_retries
+                    )
+                    if not retry:
+                        if response.status >= 400:
+                            await self._report_error(response)
+                        response.raise_for_status()
+                        data = self.json_loads(await response.read())
+                        break
+                    status = response.status
+                    retry_after = response.headers.get("Retry-After")
+
+            delay = retry_delay(
+                retry_after, attempt, self.backoff_base, self.backoff_cap
+            )
+            print(f"HTTP {status} from {endpoint}, retrying in {delay:.1f}s")
+            if self.rate_limiter is None:
+                await asyncio.sleep(delay)
+            else:
+                self.rate_limiter.record_retry()
+                if status == 429:
+                    self.rate_limiter.pause(delay)
+                else:
+                    await asyncio.sleep(delay)
+            attempt += 1
+
+        if self.cache is not None and data.get("success", True) is not False:
+            self.cache.set(endpoint, params, data)
+        return data
+
+    async def _fetch_columns(
+        self,
+        endpoint,
+        exchange,
+        pair,
+        interval,
+        limit,
+        refresh=False,
+        incremental=False,
+    ):
+        metric = endpoint.rsplit("/", 1)[-1]
+        params = {"ex": exchange, "pair": pair, "interval": interval, "limit": limit}
+        if not incremental or self.store is None:
+            request = await self._request(endpoint, params=params, refresh=refresh)
+            return decode_rows(request["data"], metric)
+
+        # SQLite calls run in worker threads to keep the event loop free
+        stored_rows = await asyncio.to_thread(
+            self.store.row_count, exchange, pair, interval, metric
+        )
+        if self.store_max_age is not None and not refresh:
+            updated = await asyncio.to_thread(
+                self.store.last_updated, exchange, pair, interval, metric
+            )
+            if (
+                updated is not None
+                and time.time() - updated <= self.store_max_age
+                and stored_rows >= limit
+            ):
+                stored = await asyncio.to_thread(
+                    self.store.read, exchange, pair, interval, metric
+                )
+                return {name: stored[name].to_numpy() for name in stored.columns}
+
+        latest = await asyncio.to_thread(
+            self.store.latest_timestamp, exchange, pair, interval, metric
+        )
+        params["limit"] = top_up_limit(latest, metric, interval, limit, stored_rows)
+        try:
+            request = await self._request(endpoint, params=params, refresh=refresh)
+            await asyncio.to_thread(
+                self.store.upsert,
+                exchange,
+                pair,
+                interval,
+                metric,
+                pd.DataFrame(decode_rows(request["data"], metric), copy=False),
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            if latest is None:
+                raise
+            print(f"Top-up of {metric} failed, serving stored history: {err}")
+
+        stored = await asyncio.to_thread(
+            self.store.read, exchange, pair, interval, metric
+        )
+        return {name: stored[name].to_numpy() for name in stored.columns}
+
+    async def get_available_pairs(self, coin, refresh=False):
+        endpoint = "/public/v2/instrument"
+        params = {"symbol": coin}
+        data = await self._request(endpoint, params=params, refresh=refresh)
+        return available_pairs_frame(data, coin)
+
+    async def fetch_ohlc_oi_data(
+        self, exchange, pair, interval="h24", limit=50, refresh=False, incremental=False
+    ):
+        endpoint = "/public/v2/indicator/open_interest_ohlc"
+        columns = await self._fetch_columns(
+            endpoint, exchange, pair, interval, limit, refresh, incremental
+        )
+        return decode_frame(columns, "open_interest_ohlc")
+
+    async def fetch_price_ohlc_data(
+        self, exchange, pair, interval="h24", limit=50, refresh=False, incremental=False
+    ):
+        endpoint = "/public/v2/indicator/price_ohlc"
+        columns = await self._fetch_columns(
+            endpoint, exchange, pair, interval, limit, refresh, incremental
+        )
+        return decode_frame(columns, "price_ohlc")
+
+    async def fetch_top_long_short_ratio(
+        self, exchange, pair, interval="h24", limit=50, refresh=False, incremental=False
+    ):
+        endpoint = "/public/v2/indicator/top_long_short_account_ratio"
+        columns = await self._fetch_columns(
+            endpoint, exchange, pair, interval, limit, refresh, incremental
+        )
+        return decode_frame(columns, "top_long_short_account_ratio")
+
+    async def fetch_top_long_short_position_ratio(
+        self, exchange, pair, interval="h24", limit=50, refresh=False, incremental=False
+    ):
+        endpoint = "/public/v2/indicator/top_long_short_position_ratio"
+        columns = await self._fetch_columns(
+            endpoint, exchange, pair, interval, limit, refresh, incremental
+        )
+        return decode_frame(columns, "top_long_short_position_ratio")
+
+    async def fetch_top_long_short_loser(
+        self, exchange, pair, interval="h24", limit=50, refresh=False, incremental=False
+    ):
+        endpoint = "/public/v2/indicator/long_short_accounts"
+        columns = await self._fetch_columns(
+            endpoint, exchange, pair, interval, limit, refresh, incremental
+        )
+        return decode_frame(columns, "long_short_accounts")
+
+    async def fetch_dashboard_bundle(
+        self, exchange, pair, interval="h24", limit=50, refresh=False, incremental=False
+    ):
+        bundle = DashboardBundle(series=PairSeries(exchange, pair, interval))
+
+        async def timed_fetch(name, method):
+            start = time.perf_counter()
+            try:
+                return await getattr(self, method)(
+                    exchange,
+                    pair,
+                    interval=interval,
+                    limit=limit,
+                    refresh=refresh,
+                    incremental=incremental,
+                )
+            finally:
+                bundle.timings[name] = time.perf_counter() - start
+
+        names = list(self.DASHBOARD_FETCHES)
+        results = await asyncio.gather(
+            *(timed_fetch(name, self.DASHBOARD_FETCHES[name]) for name in names),
+            return_exceptions=True,
+        )
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                print(f"Failed to fetch {name}: {result}")
+                bundle.errors[name] = result
+            else:
+                bundle.add(name, result)
+
+        return bundle
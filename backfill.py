@@ -0,0 +1,209 @@
+# Downloads history beyond the dashboard's 50 bars by paging backwards through
+# each series, and writes it to the candle store.
+#
+#   python backfill.py --pair Binance:BTCUSDT:h1 --since 2023-01-01
+#
+# Progress is checkpointed after every page, so an interrupted run resumes where
+# it stopped. Series run in parallel; every request goes through the client's
+# rate limiter.
+import argparse
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from candle_store import METRICS
+from column_store import DEFAULT_STORE, open_store
+from poller import parse_watch
+from stream6 import CoinGlassAPI
+
+
+class Checkpoints:
+    # JSON file of "exchange|pair|interval|metric" -> {"oldest": epoch ms of the
+    # oldest stored bar, "exhausted": the API has no older bars}
+    def __init__(self, path="data/backfill.json"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._state = {}
+        if os.path.exists(path):
+            with open(path) as checkpoint_file:
+                self._state = json.load(checkpoint_file)
+
+    @staticmethod
+    def key(exchange, pair, interval, metric):
+        return "|".join([exchange, pair, interval, metric])
+
+    def get(self, exchange, pair, interval, metric):
+        with self._lock:
+            return dict(self._state.get(self.key(exchange, pair, interval, metric), {}))
+
+    def update(self, exchange, pair, interval, metric, **values):
+        with self._lock:
+            entry = self._state.setdefault(
+                self.key(exchange, pair, interval, metric), {}
+            )
+            entry.update(values)
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Written to a temporary file first so a crash never leaves it torn
+            temporary = f"{self.path}.tmp"
+            with open(temporary, "w") as checkpoint_file:
+                json.dump(self._state, checkpoint_file, indent=1)
+            os.replace(temporary, self.path)
+
+
+class Backfill:
+    def __init__(
+        self,
+        api,
+        store=None,
+        checkpoints=None,
+        page_limit=1000,
+        max_workers=8,
+    ):
+        self.api = api
+        self.store = store or api.store
+        self.checkpoints = checkpoints or Checkpoints()
+        self.page_limit = page_limit
+        self.max_workers = max_workers
+
+    def backfill_series(
+        self, exchange, pair, interval, metric, since=None, max_pages=None
+    ):
+        # Pages from the checkpoint (or now) back to `since` (epoch ms); returns
+        # the number of bars written. A later run with an older `since` resumes
+        # from where this one stopped.
+        checkpoint = self.checkpoints.get(exchange, pair, interval, metric)
+        scale = 1000 if METRICS[metric]["unit"] == "s" else 1
+        time_column = METRICS[metric]["time"]
+        oldest = checkpoint.get("oldest")
+        written = 0
+        pages = 0
+
+        def reached():
+            return checkpoint.get("exhausted") or (
+                since is not None and oldest is not None and oldest <= since
+            )
+
+        while not reached() and (max_pages is None or pages < max_pages):
+            columns = self.api.fetch_page(
+                metric,
+                exchange,
+                pair,
+                interval=interval,
+                limit=self.page_limit,
+                end_time=None if oldest is None else oldest - 1,
+            )
+            pages += 1
+            times = columns[time_column]
+            if oldest is not None:
+                # Drop anything at or after the previous page's oldest bar, in
+                # case endTime is inclusive
+                keep = times * scale < oldest
+                columns = {name: values[keep] for name, values in columns.items()}
+                times = columns[time_column]
+            if not len(times):
+                checkpoint["exhausted"] = True
+                self.checkpoints.update(
+                    exchange, pair, interval, metric, exhausted=True
+                )
+                break
+
+            written += self.store.upsert(
+                exchange, pair, interval, metric, pd.DataFrame(columns, copy=False)
+            )
+            oldest = int(times.min()) * scale
+            checkpoint["exhausted"] = len(times) < self.page_limit
+            self.checkpoints.update(
+                exchange,
+                pair,
+                interval,
+                metric,
+                oldest=oldest,
+                exhausted=checkpoint["exhausted"],
+            )
+        return written
+
+    def run(self, series, metrics=None, since=None, max_pages=None):
+        # series: (exchange, pair, interval) tuples; metrics default to all of
+        # METRICS. Returns bars written per (exchange, pair, interval, metric).
+        since = None if since is None else int(pd.Timestamp(since).timestamp() * 1000)
+        jobs = [
+            (exchange, pair, interval, metric)
+            for exchange, pair, interval in series
+            for metric in metrics or METRICS
+        ]
+
+        def run_job(job):
+            try:
+                return self.backfill_series(*job, since=since, max_pages=max_pages)
+            except Exception as err:
+                print(f"Backfill of {' '.join(job)} stopped: {err}")
+                return None
+
+        # Pages of one series depend on each other; different series run in
+        # parallel, throttled by the client's rate limiter
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(jobs, executor.map(run_job, jobs)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill CoinGlass history")
+    parser.add_argument(
+        "--pair",
+        action="append",
+        default=[],
+        required=True,
+        metavar="EXCHANGE:PAIR[:INTERVAL]",
+        help="series to backfill; repeatable",
+    )
+    parser.add_argument(
+        "--metric",
+        action="append",
+        choices=list(METRICS),
+        help="endpoint to backfill; repeatable, default all",
+    )
+    parser.add_argument("--since", help="stop at this date, e.g. 2023-01-01")
+    parser.add_argument("--max-pages", type=int, help="pages per series this run")
+    parser.add_argument("--page-limit", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument(
+        "--store",
+        default=DEFAULT_STORE,
+        help="ColumnStore directory, or a .sqlite file for CandleStore",
+    )
+    parser.add_argument("--checkpoints", default="data/backfill.json")
+    parser.add_argument("--config", default="config.json")
+    args = parser.parse_args()
+
+    with open(args.config) as config_file:
+        config = json.load(config_file)
+    with CoinGlassAPI(
+        config["coinglassSecret"], store=open_store(args.store)
+    ) as coinglass_api:
+        backfill = Backfill(
+            coinglass_api,
+            checkpoints=Checkpoints(args.checkpoints),
+            page_limit=args.page_limit,
+            max_workers=args.workers,
+        )
+        try:
+            results = backfill.run(
+                [parse_watch(spec) for spec in args.pair],
+                metrics=args.metric,
+                since=args.since,
+                max_pages=args.max_pages,
+            )
+        except KeyboardInterrupt:
+            print("Interrupted; rerun to resume from the checkpoints")
+            return
+    for job, written in results.items():
+        status = "failed" if written is None else f"{written} bars"
+        print(f"{' '.join(job)}: {status}")
+
+
+if __name__ == "__main__":
+    main()
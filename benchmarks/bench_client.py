@@ -0,0 +1,184 @@
+# Offline benchmark of CoinGlassAPI and the dashboard's data path against the
+# local mock server. Run from the repository root:
+#
+#   python benchmarks/bench_client.py --latency 0.05 --output results.json
+#   python benchmarks/bench_client.py --baseline results.json
+#
+# With --baseline the run exits non-zero when any p50 regresses by more than
+# --tolerance, so it can gate changes. --error-rate and --throttle-rate make the
+# mock answer some requests 500 / 429; calls that still fail after the client's
+# retries are counted per case rather than stopping the run.
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_server import MockCoinGlassServer  # noqa: E402
+from payloads import load_payload, price_ohlc_payload  # noqa: E402
+from stream6 import CoinGlassAPI, decode_frame, decode_rows, get_json_decoder  # noqa
+
+EXCHANGE = "Binance"
+PAIR = "BTCUSDT"
+
+
+def client_cases(api, limit):
+    return {
+        "get_available_pairs": lambda: api.get_available_pairs("BTC"),
+        "fetch_ohlc_oi_data": lambda: api.fetch_ohlc_oi_data(
+            EXCHANGE, PAIR, limit=limit
+        ),
+        "fetch_price_ohlc_data": lambda: api.fetch_price_ohlc_data(
+            EXCHANGE, PAIR, limit=limit
+        ),
+        "fetch_top_long_short_ratio": lambda: api.fetch_top_long_short_ratio(
+            EXCHANGE, PAIR, limit=limit
+        ),
+        "fetch_top_long_short_position_ratio": lambda: (
+            api.fetch_top_long_short_position_ratio(EXCHANGE, PAIR, limit=limit)
+        ),
+        "fetch_top_long_short_loser": lambda: api.fetch_top_long_short_loser(
+            EXCHANGE, PAIR, limit=limit
+        ),
+        "fetch_dashboard_bundle": lambda: api.fetch_dashboard_bundle(EXCHANGE, PAIR),
+    }
+
+
+def decode_cases(limit):
+    # DataFrame building alone, without HTTP
+    loads = get_json_decoder()
+    payload = load_payload("price_ohlc", lambda: price_ohlc_payload(limit=limit))
+    rows = loads(payload)["data"]
+    return {
+        "decode_price_ohlc": lambda: decode_frame(
+            decode_rows(rows, "price_ohlc"), "price_ohlc"
+        ),
+    }
+
+
+def succeeds(case):
+    # fetch_dashboard_bundle reports failed fetches in .errors instead of raising
+    try:
+        return not getattr(case(), "errors", None)
+    except Exception:
+        return False
+
+
+def measure(case, iterations, concurrency):
+    # Latency percentiles cover successful calls only
+    latencies = []
+    failures = 0
+
+    def timed():
+        nonlocal failures
+        start = time.perf_counter()
+        if succeeds(case):
+            latencies.append(time.perf_counter() - start)
+        else:
+            failures += 1
+
+    # Warm up connections and lazy imports outside the measured window
+    succeeds(case)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(timed) for _ in range(iterations)]:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    succeeds(case)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50, p90, p99 = (
+        np.percentile(latencies, [50, 90, 99]) * 1000 if latencies else [np.nan] * 3
+    )
+    return {
+        "p50_ms": p50,
+        "p90_ms": p90,
+        "p99_ms": p99,
+        "throughput_per_s": len(latencies) / elapsed,
+        "error_rate": failures / iterations,
+        "peak_kb": peak / 1024,
+    }
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before and result["p50_ms"] > before["p50_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p50 {before['p50_ms']:.2f}ms -> {result['p50_ms']:.2f}ms"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CoinGlassAPI offline")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--retry-after", type=int, default=1, help="Retry-After of throttled replies"
+    )
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with MockCoinGlassServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+    ) as server:
+        # No cache and no rate limit, so every call measures a full round trip
+        with CoinGlassAPI(
+            "benchmark",
+            base_url=server.url,
+            requests_per_minute=None,
+            backoff_base=0.01,
+        ) as api:
+            cases = {**client_cases(api, args.limit), **decode_cases(args.limit)}
+            results = {}
+            print(
+                f"{'case':<38} {'p50':>8} {'p90':>8} {'p99':>8} "
+                f"{'ops/s':>8} {'errors':>7} {'peak':>9}"
+            )
+            for name, case in cases.items():
+                result = results[name] = measure(
+                    case, args.iterations, args.concurrency
+                )
+                print(
+                    f"{name:<38} {result['p50_ms']:>6.2f}ms {result['p90_ms']:>6.2f}ms "
+                    f"{result['p99_ms']:>6.2f}ms {result['throughput_per_s']:>8.1f} "
+                    f"{result['error_rate']:>7.1%} {result['peak_kb']:>7.0f}KB"
+                )
+            print(f"Connections: {api.connection_stats()}")
+
+    if args.output:
+        with open(args.output, "w") as out:
+            json.dump(results, out, indent=2)
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# Cold import cost of the client, each sample in a fresh interpreter. Run from
+# the repository root: python benchmarks/bench_import.py
+#
+# Also reports whether importing stream6 pulled in streamlit or plotly, which
+# only the dashboard needs.
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = sorted({{name.split(".")[0] for name in sys.modules}} & {{"plotly", "streamlit"}})
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def sample(module):
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold import times")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "modules",
+        nargs="*",
+        default=[
+            "stream6",
+            "async_coinglass",
+            "numpy",
+            "pandas",
+            "requests",
+            "plotly.express",
+            "streamlit",
+        ],
+    )
+    args = parser.parse_args()
+
+    print(f"{'module':<16} {'median':>9} {'min':>9}  loads")
+    for module in args.modules:
+        samples = [sample(module) for _ in range(args.repeat)]
+        seconds = np.array([result["seconds"] for result in samples]) * 1000
+        heavy = ", ".join(samples[-1]["heavy"]) or "-"
+        print(
+            f"{module:<16} {np.median(seconds):>7.0f}ms {seconds.min():>7.0f}ms  {heavy}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Compares the JSON backends CoinGlassAPI can decode responses with.
+# Run from the repository root: python benchmarks/bench_json.py
+import argparse
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from payloads import instrument_payload, load_payload, price_ohlc_payload  # noqa: E402
+from stream6 import JSON_BACKENDS, get_json_decoder  # noqa: E402
+
+
+def peak_memory(decode, payload):
+    tracemalloc.start()
+    result = decode(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON decoding backends")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument(
+        "--ohlc-limit", type=int, default=4500, help="bars in the synthetic payload"
+    )
+    args = parser.parse_args()
+
+    payloads = {
+        "instrument": load_payload("instrument", instrument_payload),
+        "price_ohlc": load_payload(
+            "price_ohlc", lambda: price_ohlc_payload(limit=args.ohlc_limit)
+        ),
+    }
+
+    print(f"{'payload':<12} {'backend':<8} {'size':>9} {'decode':>10} {'peak mem':>10}")
+    for name, payload in payloads.items():
+        for backend in JSON_BACKENDS:
+            try:
+                decode = get_json_decoder(backend)
+            except ImportError:
+                print(f"{name:<12} {backend:<8} {'not installed':>31}")
+                continue
+            seconds = min(
+                timeit.repeat(
+                    lambda: decode(payload), number=args.number, repeat=args.repeat
+                )
+            )
+            print(
+                f"{name:<12} {backend:<8} {len(payload) / 1024:>7.0f}KB "
+                f"{seconds / args.number * 1000:>8.2f}ms "
+                f"{peak_memory(decode, payload) / 1024:>8.0f}KB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# Figure build time and serialized size of the CoinGlassPlotter line charts in
+# each render mode. Run from the repository root: python benchmarks/bench_plot.py
+#
+# Series are plotted at full length (downsampling off) so the render modes are
+# compared on the same number of points; the "lttb" row shows the default
+# svg chart capped at MAX_POINTS. Skeleton caching is off for this table, so
+# "build" is the time of a full figure build.
+#
+# A second table times three ways of building each figure at the default
+# MAX_POINTS: "px", the plot_* methods as they were before skeleton caching
+# (plotly express over the whole downsampled frame, including its long-format
+# reshape); "rebuilt", a skeleton built from the first row on every call
+# (CACHE_SKELETONS off); and "skeleton", a copy of the cached skeleton.
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from downsample import downsample_line, downsample_ohlc  # noqa: E402
+from stream6 import CoinGlassPlotter  # noqa: E402
+
+
+def synthetic_frames(points):
+    rng = np.random.default_rng(0)
+    times = pd.date_range("2020-01-01", periods=points, freq="h").to_numpy()
+    close = 30000 + np.cumsum(rng.normal(0, 50, points))
+    long_ratio = np.clip(50 + np.cumsum(rng.normal(0, 0.5, points)), 1, 99)
+    prices = pd.DataFrame(
+        {"t": times, "o": close, "h": close + 25, "l": close - 25, "c": close}
+    )
+    ratios = pd.DataFrame(
+        {"createTime": times, "longRatio": long_ratio, "shortRatio": 100 - long_ratio}
+    )
+    return prices, ratios
+
+
+def full_frame_figures(prices, ratios, max_points=CoinGlassPlotter.MAX_POINTS):
+    # The figure builds CoinGlassPlotter made before skeleton caching
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    def price():
+        df = downsample_line(prices, "t", "c", max_points)
+        return px.line(
+            df, x="t", y="c", title="Price", labels={"c": "Closing Price", "t": "Date"}
+        )
+
+    def candles():
+        df = downsample_ohlc(prices, max_points)
+        return go.Figure(
+            data=[
+                go.Candlestick(
+                    x=df["t"], open=df["o"], high=df["h"], low=df["l"], close=df["c"]
+                )
+            ],
+            layout=go.Layout(
+                title="OHLC Candlestick Chart",
+                xaxis_title="Date",
+                yaxis_title="Price",
+                xaxis_rangeslider_visible=False,
+            ),
+        )
+
+    def ratio():
+        df = downsample_line(ratios, "createTime", "longRatio", max_points)
+        fig = px.line(
+            df,
+            x="createTime",
+            y=["longRatio", "shortRatio"],
+            title="Top Traders Accounts Ratio",
+            labels={
+                "createTime": "Date",
+                "variable": "Ratio Type",
+                "value": "Ratio (%)",
+            },
+            color_discrete_sequence=["green", "red"],
+        )
+        fig.update_layout(yaxis=dict(range=[0, 100], dtick=10, title="Percentage"))
+        return fig
+
+    return {"price": price, "candles": candles, "ratio": ratio}
+
+
+def best_time(build, repeat):
+    return min(timeit.repeat(build, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CoinGlassPlotter figures")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--points", type=int, nargs="*", default=[1_000, 10_000, 100_000]
+    )
+    args = parser.parse_args()
+
+    CoinGlassPlotter.CACHE_SKELETONS = False
+    print(f"{'chart':<8} {'points':>8} {'mode':<6} {'build':>10} {'json':>10}  trace")
+    for points in args.points:
+        prices, ratios = synthetic_frames(points)
+        charts = {
+            "price": lambda **options: CoinGlassPlotter.plot_closing_prices(
+                prices, "Price", **options
+            ),
+            "ratio": lambda **options: CoinGlassPlotter.plot_long_short_ratios(
+                ratios, **options
+            ),
+        }
+        runs = [
+            (mode, {"max_points": points, "render_mode": mode})
+            for mode in CoinGlassPlotter.RENDER_MODES
+        ]
+        runs.append(("lttb", {}))
+        for chart, build in charts.items():
+            for mode, options in runs:
+                seconds = best_time(lambda: build(**options), args.repeat)
+                fig = build(**options)
+                size = len(fig.to_json())
+                print(
+                    f"{chart:<8} {points:>8} {mode:<6} {seconds * 1000:>8.1f}ms "
+                    f"{size / 1024:>8.0f}KB  {fig.data[0].type}"
+                )
+
+    print()
+    print(
+        f"{'chart':<8} {'points':>8} {'px':>10} {'rebuilt':>10} {'skeleton':>10} "
+        f"{'speedup':>8}"
+    )
+    for points in args.points:
+        prices, ratios = synthetic_frames(points)
+        original = full_frame_figures(prices, ratios)
+        charts = {
+            "price": lambda: CoinGlassPlotter.plot_closing_prices(prices, "Price"),
+            "candles": lambda: CoinGlassPlotter.plot_candlestick_chart(prices),
+            "ratio": lambda: CoinGlassPlotter.plot_long_short_ratios(ratios),
+        }
+        for chart, build in charts.items():
+            full = best_time(original[chart], args.repeat)
+            CoinGlassPlotter.CACHE_SKELETONS = False
+            rebuilt = best_time(build, args.repeat)
+            CoinGlassPlotter.CACHE_SKELETONS = True
+            build()
+            cached = best_time(build, args.repeat)
+            # speedup of the cached skeleton over the original px build
+            print(
+                f"{chart:<8} {points:>8} {full * 1000:>8.1f}ms "
+                f"{rebuilt * 1000:>8.1f}ms {cached * 1000:>8.1f}ms "
+                f"{full / cached:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+# Local stand-in for open-api.coinglass.com that replays recorded /public/v2
+# payloads with configurable latency and error injection.
+#
+#   python benchmarks/mock_server.py serve --port 8765 --latency 0.05
+#   python benchmarks/mock_server.py record --exchange Binance --pair BTCUSDT
+#
+# Point a client at it with CoinGlassAPI(api_key, base_url="http://127.0.0.1:8765").
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from payloads import (  # noqa: E402
+    FIXTURES_DIR,
+    instrument_payload,
+    long_short_payload,
+    open_interest_ohlc_payload,
+    price_ohlc_payload,
+)
+from stream6 import INTERVAL_SECONDS, CoinGlassAPI  # noqa: E402
+
+# Endpoint name -> synthetic payload factory taking (limit, interval_seconds,
+# end), end being the request's endTime in epoch ms or None
+ENDPOINTS = {
+    "instrument": lambda limit, interval_seconds, end: instrument_payload(),
+    "price_ohlc": lambda limit, interval_seconds, end: price_ohlc_payload(
+        limit, interval_seconds, end=end
+    ),
+    "open_interest_ohlc": lambda limit, interval_seconds, end: (
+        open_interest_ohlc_payload(limit, interval_seconds, end=end)
+    ),
+    "top_long_short_account_ratio": lambda limit, interval_seconds, end: (
+        long_short_payload(limit, interval_seconds, seed=1, end=end)
+    ),
+    "top_long_short_position_ratio": lambda limit, interval_seconds, end: (
+        long_short_payload(limit, interval_seconds, seed=2, end=end)
+    ),
+    "long_short_accounts": lambda limit, interval_seconds, end: long_short_payload(
+        limit, interval_seconds, seed=3, end=end
+    ),
+}
+
+
+def row_time(row):
+    # Epoch ms of a recorded row; price_ohlc rows are positional, in seconds
+    if isinstance(row, dict):
+        return row.get("t", row.get("createTime"))
+    return row[0] * 1000
+
+
+class MockCoinGlassServer:
+    # latency: base delay in seconds, jitter: extra uniform random delay
+    # error_rate / throttle_rate: fraction of requests answered 500 / 429
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        throttle_rate=0.0,
+        retry_after=1,
+        fixtures_dir=FIXTURES_DIR,
+        seed=0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.fixtures_dir = fixtures_dir
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+        self._recorded = {}
+        self._bodies = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this Nagle's
+            # algorithm adds ~40ms to every keep-alive response
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                status, body, headers = server.respond(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _recorded_payload(self, name):
+        if name not in self._recorded:
+            path = os.path.join(self.fixtures_dir, f"{name}.json")
+            payload = None
+            if os.path.exists(path):
+                with open(path) as payload_file:
+                    payload = json.load(payload_file)
+            self._recorded[name] = payload
+        return self._recorded[name]
+
+    def payload(self, name, params):
+        limit = int(params.get("limit", 50))
+        interval_seconds = INTERVAL_SECONDS.get(params.get("interval"), 86400)
+        end = int(params["endTime"]) if "endTime" in params else None
+        # Bodies are encoded once per shape so serving stays cheap
+        key = (name, limit, interval_seconds, end)
+        with self._lock:
+            if key not in self._bodies:
+                payload = self._recorded_payload(name)
+                if payload is None:
+                    payload = ENDPOINTS[name](limit, interval_seconds, end)
+                elif isinstance(payload["data"], list):
+                    rows = payload["data"]
+                    if end is not None:
+                        rows = [row for row in rows if row_time(row) <= end]
+                    payload = {**payload, "data": rows[-limit:]}
+                self._bodies[key] = json.dumps(payload).encode()
+            return self._bodies[key]
+
+    def respond(self, path):
+        url = urlparse(path)
+        name = url.path.rsplit("/", 1)[-1]
+        with self._lock:
+            self.requests += 1
+            roll = self.random.random()
+            delay = self.latency + self.random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+        if name not in ENDPOINTS:
+            return 404, b'{"code": "404", "msg": "Not Found"}', {}
+        if roll < self.throttle_rate:
+            with self._lock:
+                self.errors += 1
+            return (
+                429,
+                b'{"code": "429", "msg": "Too Many Requests"}',
+                {"Retry-After": str(self.retry_after)},
+            )
+        if roll < self.throttle_rate + self.error_rate:
+            with self._lock:
+                self.errors += 1
+            return 500, b'{"code": "500", "msg": "Injected error"}', {}
+        return 200, self.payload(name, dict(parse_qsl(url.query))), {}
+
+
+def record(exchange, pair, interval, limit, fixtures_dir=FIXTURES_DIR):
+    # Saves live responses for every replayed endpoint; needs config.json's key
+    with open("config.json") as config_file:
+        config = json.load(config_file)
+    os.makedirs(fixtures_dir, exist_ok=True)
+    with CoinGlassAPI(config["coinglassSecret"]) as api:
+        for name in ENDPOINTS:
+            if name == "instrument":
+                endpoint, params = "/public/v2/instrument", None
+            else:
+                endpoint = f"/public/v2/indicator/{name}"
+                params = {
+                    "ex": exchange,
+                    "pair": pair,
+                    "interval": interval,
+                    "limit": limit,
+                }
+            payload = api._request(endpoint, params=params)
+            with open(os.path.join(fixtures_dir, f"{name}.json"), "w") as out:
+                json.dump(payload, out)
+            print(f"Recorded {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock CoinGlass API server")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--latency", type=float, default=0.0)
+    serve.add_argument("--jitter", type=float, default=0.0)
+    serve.add_argument("--error-rate", type=float, default=0.0)
+    serve.add_argument("--throttle-rate", type=float, default=0.0)
+    recorder = commands.add_parser("record")
+    recorder.add_argument("--exchange", default="Binance")
+    recorder.add_argument("--pair", default="BTCUSDT")
+    recorder.add_argument("--interval", default="h1")
+    recorder.add_argument("--limit", type=int, default=4500)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.exchange, args.pair, args.interval, args.limit)
+        return
+
+    server = MockCoinGlassServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+    )
+    print(f"Serving mock CoinGlass API on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import json
+import os
+import random
+import time
+
+# Synthetic payloads shaped like the /public/v2 responses, used when no
+# recorded payload is available
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def bar_end(interval_seconds, end=None):
+    # Open time (epoch s) just past the newest synthetic bar: the forming bar is
+    # left out, and with end (epoch ms) the bar open at end is the newest
+    if end is None:
+        return int(time.time()) // interval_seconds * interval_seconds
+    return (int(end / 1000) // interval_seconds + 1) * interval_seconds
+
+
+def instrument_payload(exchanges=30, instruments_per_exchange=400, seed=0):
+    rng = random.Random(seed)
+    quotes = ["USDT", "USD", "BUSD", "USDC", "BTC", "ETH"]
+    data = {}
+    for exchange in range(exchanges):
+        items = []
+        for index in range(instruments_per_exchange):
+            base = f"C{rng.randrange(instruments_per_exchange * 2)}"
+            if index == 0:
+                base = "BTC"
+            quote = rng.choice(quotes)
+            items.append(
+                {
+                    "instrumentId": f"{base}{quote}",
+                    "baseAsset": base,
+                    "quoteAsset": quote,
+                }
+            )
+        data[f"Exchange{exchange}"] = items
+    return {"code": "0", "msg": "success", "data": data, "success": True}
+
+
+def price_ohlc_payload(limit=50, interval_seconds=86400, seed=0, end=None):
+    rng = random.Random(seed)
+    now = bar_end(interval_seconds, end)
+    close = 30000.0
+    rows = []
+    for index in range(limit, 0, -1):
+        open_ = close
+        close = open_ * (1 + rng.gauss(0, 0.02))
+        rows.append(
+            [
+                now - index * interval_seconds,
+                f"{open_:.2f}",
+                f"{max(open_, close) * 1.01:.2f}",
+                f"{min(open_, close) * 0.99:.2f}",
+                f"{close:.2f}",
+                f"{rng.uniform(1e3, 1e5):.2f}",
+            ]
+        )
+    return {"code": "0", "msg": "success", "data": rows, "success": True}
+
+
+def open_interest_ohlc_payload(limit=50, interval_seconds=86400, seed=0, end=None):
+    rng = random.Random(seed)
+    now = bar_end(interval_seconds, end)
+    close = 1e5
+    rows = []
+    for index in range(limit, 0, -1):
+        open_ = close
+        close = open_ * (1 + rng.gauss(0, 0.03))
+        rows.append(
+            {
+                "t": (now - index * interval_seconds) * 1000,
+                "o": round(open_, 2),
+                "h": round(max(open_, close) * 1.01, 2),
+                "l": round(min(open_, close) * 0.99, 2),
+                "c": round(close, 2),
+            }
+        )
+    return {"code": "0", "msg": "success", "data": rows, "success": True}
+
+
+def long_short_payload(limit=50, interval_seconds=86400, seed=0, end=None):
+    rng = random.Random(seed)
+    now = bar_end(interval_seconds, end)
+    rows = []
+    for index in range(limit, 0, -1):
+        long_ratio = round(rng.uniform(35, 65), 2)
+        rows.append(
+            {
+                "createTime": (now - index * interval_seconds) * 1000,
+                "longRatio": long_ratio,
+                "shortRatio": round(100 - long_ratio, 2),
+                "longShortRatio": round(long_ratio / (100 - long_ratio), 4),
+            }
+        )
+    return {"code": "0", "msg": "success", "data": rows, "success": True}
+
+
+def load_payload(name, default):
+    # Prefers a recorded payload in benchmarks/fixtures, e.g. fixtures/price_ohlc.json
+    path = os.path.join(FIXTURES_DIR, f"{name}.json")
+    if os.path.exists(path):
+        with open(path, "rb") as payload_file:
+            return payload_file.read()
+    return json.dumps(default()).encode()
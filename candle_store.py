@@ -0,0 +1,170 @@
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# Stored columns for each metric, keyed by the last segment of its endpoint.
+# "unit" is the resolution of the raw timestamps returned by the API.
+METRICS = {
+    "price_ohlc": {"time": "t", "unit": "s", "columns": ["o", "h", "l", "c", "v"]},
+    "open_interest_ohlc": {"time": "t", "unit": "ms", "columns": ["o", "h", "l", "c"]},
+    "top_long_short_account_ratio": {
+        "time": "createTime",
+        "unit": "ms",
+        "columns": ["longRatio", "shortRatio", "longShortRatio"],
+    },
+    "top_long_short_position_ratio": {
+        "time": "createTime",
+        "unit": "ms",
+        "columns": ["longRatio", "shortRatio", "longShortRatio"],
+    },
+    "long_short_accounts": {
+        "time": "createTime",
+        "unit": "ms",
+        "columns": ["longRatio", "shortRatio", "longShortRatio"],
+    },
+}
+
+
+# Decoded dtype of the value columns of each metric
+VALUE_DTYPES = {
+    "price_ohlc": np.float64,
+    "open_interest_ohlc": np.float64,
+    "top_long_short_account_ratio": np.float32,
+    "top_long_short_position_ratio": np.float32,
+    "long_short_accounts": np.float32,
+}
+
+
+class CandleStore:
+    # One table per metric, clustered on (exchange, pair, interval, time) so each
+    # exchange/pair/interval series is a contiguous partition of its table
+    def __init__(self, path="data/coinglass.sqlite"):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        connection = self._connection()
+        for metric, spec in METRICS.items():
+            value_columns = ", ".join(f'"{column}" REAL' for column in spec["columns"])
+            connection.execute(
+                f'CREATE TABLE IF NOT EXISTS "{metric}" ('
+                f'exchange TEXT, pair TEXT, interval TEXT, "{spec["time"]}" INTEGER, '
+                f"{value_columns}, "
+                f'PRIMARY KEY (exchange, pair, interval, "{spec["time"]}")'
+                f") WITHOUT ROWID"
+            )
+        # When each series was last written, so readers can tell fresh data from stale
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS series_updates ("
+            "exchange TEXT, pair TEXT, interval TEXT, metric TEXT, updated_at REAL, "
+            "PRIMARY KEY (exchange, pair, interval, metric)"
+            ") WITHOUT ROWID"
+        )
+        connection.commit()
+
+    def _connection(self):
+        # sqlite3 connections cannot be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            # WAL lets the dashboard read while a poller or backfill is writing
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def upsert(self, exchange, pair, interval, metric, df):
+        spec = METRICS[metric]
+        columns = [spec["time"]] + spec["columns"]
+        if df.empty:
+            return 0
+        frame = df.reindex(columns=columns).apply(pd.to_numeric, errors="coerce")
+        frame = frame.dropna(subset=[spec["time"]])
+        frame[spec["time"]] = frame[spec["time"]].astype("int64")
+        rows = [
+            (exchange, pair, interval, *row)
+            for row in frame.astype(object)
+            .where(frame.notna(), None)
+            .itertuples(index=False, name=None)
+        ]
+        placeholders = ", ".join("?" * (len(columns) + 3))
+        quoted = ", ".join(f'"{column}"' for column in columns)
+        connection = self._connection()
+        # Re-fetched bars replace the stored copy, so a still-forming bar is updated
+        connection.executemany(
+            f'INSERT OR REPLACE INTO "{metric}" (exchange, pair, interval, {quoted}) '
+            f"VALUES ({placeholders})",
+            rows,
+        )
+        connection.execute(
+            "INSERT OR REPLACE INTO series_updates VALUES (?, ?, ?, ?, ?)",
+            (exchange, pair, interval, metric, time.time()),
+        )
+        connection.commit()
+        return len(rows)
+
+    def last_updated(self, exchange, pair, interval, metric):
+        row = (
+            self._connection()
+            .execute(
+                "SELECT updated_at FROM series_updates "
+                "WHERE exchange = ? AND pair = ? AND interval = ? AND metric = ?",
+                (exchange, pair, interval, metric),
+            )
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def latest_timestamp(self, exchange, pair, interval, metric):
+        spec = METRICS[metric]
+        row = (
+            self._connection()
+            .execute(
+                f'SELECT MAX("{spec["time"]}") FROM "{metric}" '
+                f"WHERE exchange = ? AND pair = ? AND interval = ?",
+                (exchange, pair, interval),
+            )
+            .fetchone()
+        )
+        return row[0]
+
+    def row_count(self, exchange, pair, interval, metric):
+        row = (
+            self._connection()
+            .execute(
+                f'SELECT COUNT(*) FROM "{metric}" '
+                f"WHERE exchange = ? AND pair = ? AND interval = ?",
+                (exchange, pair, interval),
+            )
+            .fetchone()
+        )
+        return row[0]
+
+    def read(self, exchange, pair, interval, metric, start=None, end=None):
+        spec = METRICS[metric]
+        columns = [spec["time"]] + spec["columns"]
+        quoted = ", ".join(f'"{column}"' for column in columns)
+        query = (
+            f'SELECT {quoted} FROM "{metric}" '
+            f"WHERE exchange = ? AND pair = ? AND interval = ?"
+        )
+        args = [exchange, pair, interval]
+        if start is not None:
+            query += f' AND "{spec["time"]}" >= ?'
+            args.append(int(start))
+        if end is not None:
+            query += f' AND "{spec["time"]}" <= ?'
+            args.append(int(end))
+        query += f' ORDER BY "{spec["time"]}"'
+        rows = self._connection().execute(query, args).fetchall()
+        return pd.DataFrame(rows, columns=columns)
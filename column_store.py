@@ -0,0 +1,169 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import quote
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within a process
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+
+from candle_store import METRICS, VALUE_DTYPES, CandleStore
+
+DEFAULT_STORE = "data/columns"
+
+
+def open_store(path=DEFAULT_STORE):
+    # SQLite files keep using CandleStore; any other path is a ColumnStore directory
+    if path.endswith((".sqlite", ".db")):
+        return CandleStore(path)
+    return ColumnStore(path)
+
+
+class ColumnStore:
+    # Same interface as CandleStore, but every series is a directory holding one
+    # fixed-width .npy file per column, sorted by time and opened with
+    # np.load(mmap_mode="r"). Processes reading a series share one page-cached
+    # copy and read() slices the mapped arrays without copying.
+    #
+    # A write saves a new version of every column file and then swaps meta.json,
+    # so readers never see a half-written series. The previous version is kept
+    # for readers that loaded the old meta.json just before the swap. Writers
+    # of one series, in any process, take turns on an flock of its lock file.
+    def __init__(self, path=DEFAULT_STORE):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def close(self):
+        pass
+
+    def _directory(self, exchange, pair, interval, metric):
+        parts = [quote(part, safe="") for part in (exchange, pair, interval)]
+        return os.path.join(self.path, metric, *parts)
+
+    @contextmanager
+    def _write_lock(self, directory):
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(directory, "lock"), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _meta(self, directory):
+        try:
+            with open(os.path.join(directory, "meta.json")) as meta_file:
+                return json.load(meta_file)
+        except FileNotFoundError:
+            return None
+
+    def _load(self, directory, metric):
+        # Retried once in case a writer replaced the version between reading
+        # meta.json and opening the files
+        spec = METRICS[metric]
+        for attempt in range(2):
+            meta = self._meta(directory)
+            if meta is None:
+                return None
+            try:
+                return {
+                    name: np.load(
+                        os.path.join(directory, f"{name}.{meta['version']}.npy"),
+                        mmap_mode="r",
+                    )
+                    for name in [spec["time"]] + spec["columns"]
+                }
+            except FileNotFoundError:
+                if attempt:
+                    raise
+
+    def upsert(self, exchange, pair, interval, metric, df):
+        spec = METRICS[metric]
+        time_column = spec["time"]
+        if df.empty:
+            return 0
+        frame = df.reindex(columns=[time_column] + spec["columns"])
+        frame = frame.apply(pd.to_numeric, errors="coerce").dropna(subset=[time_column])
+        columns = {time_column: frame[time_column].to_numpy(dtype=np.int64)}
+        for name in spec["columns"]:
+            columns[name] = frame[name].to_numpy(dtype=VALUE_DTYPES[metric])
+
+        directory = self._directory(exchange, pair, interval, metric)
+        os.makedirs(directory, exist_ok=True)
+        with self._write_lock(directory):
+            meta = self._meta(directory)
+            stored = self._load(directory, metric)
+            if stored is not None:
+                # Re-fetched bars replace the stored copy, so a still-forming bar
+                # is updated
+                keep = ~np.isin(stored[time_column], columns[time_column])
+                columns = {
+                    name: np.concatenate([stored[name][keep], values])
+                    for name, values in columns.items()
+                }
+            times = columns[time_column]
+            order = np.argsort(times, kind="stable")
+            # Of duplicate timestamps within one write, the last one wins
+            unique = np.append(times[order][1:] != times[order][:-1], True)
+            order = order[unique]
+
+            version = str(time.time_ns())
+            for name, values in columns.items():
+                np.save(os.path.join(directory, f"{name}.{version}.npy"), values[order])
+            descriptor, temporary = tempfile.mkstemp(suffix=".tmp", dir=directory)
+            with os.fdopen(descriptor, "w") as meta_file:
+                json.dump(
+                    {
+                        "version": version,
+                        "rows": int(len(order)),
+                        "latest": int(times[order][-1]),
+                        "updated_at": time.time(),
+                    },
+                    meta_file,
+                )
+            os.replace(temporary, os.path.join(directory, "meta.json"))
+
+            current = {version, meta["version"] if meta else None}
+            for file_name in os.listdir(directory):
+                if (
+                    file_name.endswith(".npy")
+                    and file_name.split(".")[-2] not in current
+                ):
+                    os.remove(os.path.join(directory, file_name))
+        return len(frame)
+
+    def last_updated(self, exchange, pair, interval, metric):
+        meta = self._meta(self._directory(exchange, pair, interval, metric))
+        return meta["updated_at"] if meta else None
+
+    def latest_timestamp(self, exchange, pair, interval, metric):
+        meta = self._meta(self._directory(exchange, pair, interval, metric))
+        return meta["latest"] if meta else None
+
+    def row_count(self, exchange, pair, interval, metric):
+        meta = self._meta(self._directory(exchange, pair, interval, metric))
+        return meta["rows"] if meta else 0
+
+    def read(self, exchange, pair, interval, metric, start=None, end=None):
+        spec = METRICS[metric]
+        names = [spec["time"]] + spec["columns"]
+        columns = self._load(self._directory(exchange, pair, interval, metric), metric)
+        if columns is None:
+            return pd.DataFrame(columns=names)
+        times = columns[spec["time"]]
+        lo = 0 if start is None else np.searchsorted(times, int(start))
+        hi = len(times) if end is None else np.searchsorted(times, int(end), "right")
+        return pd.DataFrame(
+            {name: columns[name][lo:hi] for name in names}, columns=names, copy=False
+        )
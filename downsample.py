@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+
+def lttb_indices(x, y, threshold):
+    # Largest-Triangle-Three-Buckets: positions of `threshold` points that keep
+    # the visual shape of the line through (x, y); x must be ascending
+    length = len(x)
+    if threshold >= length or threshold < 3:
+        return np.arange(length)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # threshold - 2 buckets between the first and last point, which are kept
+    edges = np.linspace(1, length - 1, threshold - 1).astype(np.int64)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = length - 1
+    selected = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else length
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+        # Twice the area of the triangle (selected point, candidate, next bucket mean)
+        area = np.abs(
+            (x[selected] - next_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (next_y - y[selected])
+        )
+        selected = (
+            start + int(np.nanargmax(area)) if not np.isnan(area).all() else start
+        )
+        indices[bucket + 1] = selected
+    return indices
+
+
+def ascending(df, time):
+    # The fetch_* methods return bars newest first; bucketing needs oldest first
+    if df[time].is_monotonic_increasing:
+        return df
+    return df.sort_values(time, kind="stable")
+
+
+def downsample_line(df, x, y, max_points):
+    # Rows of df picked by LTTB on column y; other columns keep the same rows,
+    # so e.g. shortRatio follows longRatio
+    if len(df) <= max_points:
+        return df
+    df = ascending(df, x)
+    times = df[x].to_numpy()
+    if np.issubdtype(times.dtype, np.datetime64):
+        times = times.view(np.int64)
+    return df.iloc[lttb_indices(times, df[y].to_numpy(), max_points)]
+
+
+def downsample_ohlc(df, max_points, time="t"):
+    # Merges runs of consecutive bars into at most max_points candles: first
+    # open, highest high, lowest low, last close, summed volume
+    length = len(df)
+    if length <= max_points:
+        return df
+    df = ascending(df, time)
+    starts = np.linspace(0, length, max_points, endpoint=False).astype(np.int64)
+    ends = np.append(starts[1:], length) - 1
+    columns = {
+        time: df[time].to_numpy()[starts],
+        "o": df["o"].to_numpy()[starts],
+        "h": np.maximum.reduceat(df["h"].to_numpy(), starts),
+        "l": np.minimum.reduceat(df["l"].to_numpy(), starts),
+        "c": df["c"].to_numpy()[ends],
+    }
+    if "v" in df:
+        columns["v"] = np.add.reduceat(df["v"].to_numpy(), starts)
+    return pd.DataFrame(columns)
+
+
+def downsample_appending(df, time, downsample, max_points, previous=None, tail=100):
+    # downsample(frame, points) for frames that grow at their end, such as live
+    # ticks. The points picked for bars up to a cut are reused and later bars
+    # are appended as they are; everything is downsampled again once more than
+    # `tail` bars follow the cut. Returns the points and the state to pass back
+    # as `previous`.
+    if len(df) <= max_points:
+        return df, None
+    df = ascending(df, time)
+    times = df[time].to_numpy()
+    if previous is not None:
+        first, cut, points, head = previous
+        start = np.searchsorted(times, cut, side="right")
+        if (
+            points == max_points
+            and times[0] == first
+            and 0 < start
+            and times[start - 1] == cut
+            and len(df) - start <= tail
+        ):
+            return pd.concat([head, df.iloc[start:]], ignore_index=True), previous
+    # The newest bars may still be revised, so half the tail starts out raw
+    split = len(df) - tail // 2
+    head = downsample(df.iloc[:split], max_points - tail)
+    state = (times[0], times[split - 1], max_points, head)
+    return pd.concat([head, df.iloc[split:]], ignore_index=True), state
@@ -0,0 +1,295 @@
+import copy
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+INDICATOR_COLUMNS = [
+    "return",
+    "sma",
+    "ema",
+    "atr",
+    "oi_price_divergence",
+    "long_short_zscore",
+]
+# Larger gaps since the last computation are recomputed in one vectorized pass
+# rather than stepped bar by bar
+INCREMENTAL_MAX_BARS = 32
+
+
+########################################################################################
+# Vectorized indicators over whole NumPy arrays. NaN marks bars a metric lacks.
+
+
+def rolling_return(values, periods=1):
+    result = np.full(len(values), np.nan)
+    if len(values) > periods:
+        result[periods:] = values[periods:] / values[:-periods] - 1
+    return result
+
+
+def sma(values, window):
+    return pd.Series(values).rolling(window).mean().to_numpy()
+
+
+def ema(values, span):
+    return (
+        pd.Series(values).ewm(span=span, adjust=False, ignore_na=True).mean().to_numpy()
+    )
+
+
+def true_range(high, low, close):
+    prev_close = np.concatenate([[np.nan], close[:-1]])
+    return np.fmax(
+        high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close))
+    )
+
+
+def atr(high, low, close, window=14):
+    # Wilder's smoothing of the true range
+    return (
+        pd.Series(true_range(high, low, close))
+        .ewm(alpha=1 / window, adjust=False, ignore_na=True)
+        .mean()
+        .to_numpy()
+    )
+
+
+def rolling_zscore(values, window):
+    rolling = pd.Series(values).rolling(window)
+    return ((values - rolling.mean()) / rolling.std(ddof=0)).to_numpy()
+
+
+def oi_price_divergence(oi, close, window=5):
+    # Positive when open interest grows faster than price over the window
+    return rolling_return(oi, window) - rolling_return(close, window)
+
+
+def basis(price, reference, periods_per_year=None):
+    # Premium of price (e.g. a perpetual) over reference (e.g. spot); with
+    # periods_per_year the per-bar basis is annualized like a funding rate
+    result = np.asarray(price) / np.asarray(reference) - 1
+    return result if periods_per_year is None else result * periods_per_year
+
+
+########################################################################################
+# Incremental state: extends the indicators by one bar at a time in O(1)
+
+
+class RollingWindow:
+    def __init__(self, size):
+        self.values = deque(maxlen=size)
+        self.total = 0.0
+        self.squares = 0.0
+        self.missing = 0
+
+    def push(self, value):
+        if len(self.values) == self.values.maxlen:
+            oldest = self.values[0]
+            if np.isnan(oldest):
+                self.missing -= 1
+            else:
+                self.total -= oldest
+                self.squares -= oldest * oldest
+        self.values.append(value)
+        if np.isnan(value):
+            self.missing += 1
+        else:
+            self.total += value
+            self.squares += value * value
+
+    def full(self):
+        return len(self.values) == self.values.maxlen and not self.missing
+
+    def mean(self):
+        return self.total / len(self.values) if self.full() else np.nan
+
+    def std(self):
+        if not self.full():
+            return np.nan
+        mean = self.total / len(self.values)
+        return np.sqrt(max(self.squares / len(self.values) - mean * mean, 0.0))
+
+
+def lagged(window, value):
+    # value against the oldest entry of a full lag window, as rolling_return does
+    if len(window) < window.maxlen:
+        return np.nan
+    return value / window[0] - 1
+
+
+class IndicatorState:
+    def __init__(self, engine):
+        self.ema_alpha = 2 / (engine.ema_span + 1)
+        self.atr_window = engine.atr_window
+        self.closes = RollingWindow(engine.sma_window)
+        self.ratios = RollingWindow(engine.zscore_window)
+        self.return_lag = deque(maxlen=engine.return_periods + 1)
+        self.close_lag = deque(maxlen=engine.divergence_window + 1)
+        self.oi_lag = deque(maxlen=engine.divergence_window + 1)
+        self.ema = np.nan
+        self.atr = np.nan
+        self.prev_close = np.nan
+
+    @classmethod
+    def from_arrays(cls, engine, inputs, columns, end):
+        # State after bar end - 1, rebuilt from the inputs and indicator values
+        state = cls(engine)
+
+        def tail(values, size):
+            return values[max(end - size, 0) : end]
+
+        for value in tail(inputs["c"], engine.sma_window):
+            state.closes.push(value)
+        for value in tail(inputs["ratio"], engine.zscore_window):
+            state.ratios.push(value)
+        for window, values in [
+            (state.return_lag, inputs["c"]),
+            (state.close_lag, inputs["c"]),
+            (state.oi_lag, inputs["oi"]),
+        ]:
+            window.extend(tail(values, window.maxlen))
+        if end:
+            state.ema = columns["ema"][end - 1]
+            state.atr = columns["atr"][end - 1]
+            state.prev_close = inputs["c"][end - 1]
+        return state
+
+    def step(self, o, h, l, c, oi, ratio):
+        self.closes.push(c)
+        self.ratios.push(ratio)
+        self.return_lag.append(c)
+        self.close_lag.append(c)
+        self.oi_lag.append(oi)
+
+        if not np.isnan(c):
+            self.ema = (
+                c
+                if np.isnan(self.ema)
+                else self.ema_alpha * c + (1 - self.ema_alpha) * self.ema
+            )
+        tr = np.fmax(h - l, np.fmax(abs(h - self.prev_close), abs(l - self.prev_close)))
+        if not np.isnan(tr):
+            self.atr = (
+                tr
+                if np.isnan(self.atr)
+                else self.atr + (tr - self.atr) / self.atr_window
+            )
+        self.prev_close = c
+
+        std = self.ratios.std()
+        return (
+            lagged(self.return_lag, c),
+            self.closes.mean(),
+            self.ema,
+            self.atr,
+            lagged(self.oi_lag, oi) - lagged(self.close_lag, c),
+            (ratio - self.ratios.mean()) / std if std else np.nan,
+        )
+
+
+########################################################################################
+
+
+class IndicatorEngine:
+    # Indicators for PairSeries, cached per series version. When a series only
+    # gained bars at its end (or its newest bar was revised) the cached values
+    # are extended bar by bar; bars before the last computed one are treated as
+    # closed.
+    def __init__(
+        self,
+        sma_window=20,
+        ema_span=20,
+        atr_window=14,
+        zscore_window=30,
+        return_periods=1,
+        divergence_window=5,
+    ):
+        self.sma_window = sma_window
+        self.ema_span = ema_span
+        self.atr_window = atr_window
+        self.zscore_window = zscore_window
+        self.return_periods = return_periods
+        self.divergence_window = divergence_window
+        self.full_computations = 0
+        self.incremental_updates = 0
+        self._lock = threading.Lock()
+        # (exchange, pair, interval) -> last computation
+        self._cache = {}
+
+    def _inputs(self, series):
+        def column(metric, name):
+            if metric in series:
+                return series.columns[metric][name].astype(np.float64, copy=False)
+            return np.full(len(series), np.nan)
+
+        inputs = {name: column("price_ohlc", name) for name in ["o", "h", "l", "c"]}
+        inputs["oi"] = column("open_interest_ohlc", "c")
+        inputs["ratio"] = column("top_long_short_account_ratio", "longShortRatio")
+        return inputs
+
+    def _vectorized(self, inputs):
+        return {
+            "return": rolling_return(inputs["c"], self.return_periods),
+            "sma": sma(inputs["c"], self.sma_window),
+            "ema": ema(inputs["c"], self.ema_span),
+            "atr": atr(inputs["h"], inputs["l"], inputs["c"], self.atr_window),
+            "oi_price_divergence": oi_price_divergence(
+                inputs["oi"], inputs["c"], self.divergence_window
+            ),
+            "long_short_zscore": rolling_zscore(inputs["ratio"], self.zscore_window),
+        }
+
+    def compute(self, series):
+        key = (series.exchange, series.pair, series.interval)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry["version"] == series.version:
+                return entry["frame"]
+
+            inputs = self._inputs(series)
+            length = len(series)
+            start = None if entry is None else entry["length"] - 1
+            if (
+                start is not None
+                and 0 <= start < length
+                and series.index[start] == entry["last_time"]
+                and length - start <= INCREMENTAL_MAX_BARS
+            ):
+                state = copy.deepcopy(entry["before"])
+                rows = []
+                for position in range(start, length):
+                    if position == length - 1:
+                        before = copy.deepcopy(state)
+                    rows.append(
+                        state.step(
+                            *(
+                                inputs[name][position]
+                                for name in ["o", "h", "l", "c", "oi", "ratio"]
+                            )
+                        )
+                    )
+                new = np.array(rows, dtype=np.float64).T
+                columns = {
+                    name: np.concatenate([entry["columns"][name][:start], new[i]])
+                    for i, name in enumerate(INDICATOR_COLUMNS)
+                }
+                self.incremental_updates += 1
+            else:
+                columns = self._vectorized(inputs)
+                before = IndicatorState.from_arrays(
+                    self, inputs, columns, max(length - 1, 0)
+                )
+                self.full_computations += 1
+
+            frame = pd.DataFrame({"t": series.index, **columns}, copy=False)
+            self._cache[key] = {
+                "version": series.version,
+                "length": length,
+                "last_time": series.index[-1] if length else None,
+                "columns": columns,
+                "before": before,
+                "frame": frame,
+            }
+            return frame
@@ -0,0 +1,94 @@
+# Background process that keeps the candle store warm for a watchlist, so the
+# dashboard renders hot pairs from local data instead of fetching on click.
+#
+#   python poller.py --watch Binance:BTCUSDT:h24 --watch OKX:BTC-USDT-SWAP:h1
+#
+# Pairs can also be listed in config.json under "watchlist", e.g.
+#   "watchlist": [{"exchange": "Binance", "pair": "BTCUSDT", "interval": "h24"}]
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from column_store import DEFAULT_STORE, open_store
+from stream6 import CoinGlassAPI
+
+
+def parse_watch(spec):
+    exchange, pair, *rest = spec.split(":")
+    return exchange, pair, rest[0] if rest else "h24"
+
+
+def load_watchlist(config, specs):
+    watchlist = [
+        (item["exchange"], item["pair"], item.get("interval", "h24"))
+        for item in config.get("watchlist", [])
+    ]
+    watchlist += [parse_watch(spec) for spec in specs]
+    # Keep order but drop duplicates between config.json and the command line
+    return list(dict.fromkeys(watchlist))
+
+
+def poll_once(api, watchlist, limit=50, max_workers=4):
+    # Fetches every metric the dashboard displays; incremental fetches write the
+    # new bars into the client's store
+    def poll(watch):
+        exchange, pair, interval = watch
+        bundle = api.fetch_dashboard_bundle(
+            exchange, pair, interval=interval, limit=limit, incremental=True
+        )
+        for name, err in bundle.errors.items():
+            print(f"{exchange} {pair} {interval}: failed to poll {name}: {err}")
+        return bundle.ok
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return sum(executor.map(poll, watchlist))
+
+
+def run(api, watchlist, every=60, max_workers=4, stop=None):
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        start = time.monotonic()
+        polled = poll_once(api, watchlist, max_workers=max_workers)
+        elapsed = time.monotonic() - start
+        print(f"Polled {polled}/{len(watchlist)} pairs in {elapsed:.1f}s")
+        stop.wait(max(every - elapsed, 0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-warm the CoinGlass candle store")
+    parser.add_argument(
+        "--watch",
+        action="append",
+        default=[],
+        metavar="EXCHANGE:PAIR[:INTERVAL]",
+        help="pair to keep warm; repeatable",
+    )
+    parser.add_argument("--every", type=float, default=60, help="seconds between polls")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--store",
+        default=DEFAULT_STORE,
+        help="ColumnStore directory, or a .sqlite file for CandleStore",
+    )
+    parser.add_argument("--config", default="config.json")
+    args = parser.parse_args()
+
+    with open(args.config) as config_file:
+        config = json.load(config_file)
+    watchlist = load_watchlist(config, args.watch)
+    if not watchlist:
+        parser.error("nothing to poll: pass --watch or add a watchlist to config.json")
+
+    with CoinGlassAPI(
+        config["coinglassSecret"], store=open_store(args.store)
+    ) as coinglass_api:
+        try:
+            run(coinglass_api, watchlist, every=args.every, max_workers=args.workers)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+import threading
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from stream6 import DashboardBundle
+from timeseries import PairSeries
+
+# DashboardBundle fields the screener fetches for every instrument
+SCREEN_FIELDS = ["ohlc_oi", "price_ohlc", "long_short_ratio"]
+
+SCORE_COLUMNS = [
+    "exchange",
+    "pair",
+    "time",
+    "open_interest",
+    "oi_delta",
+    "oi_change",
+    "price_return",
+    "long_short_ratio",
+    "long_short_zscore",
+]
+
+
+def tail_matrix(frames, column, width):
+    # Last `width` values of each frame, right-aligned and NaN-padded, one row
+    # per frame
+    matrix = np.full((len(frames), width), np.nan)
+    for row, frame in enumerate(frames):
+        values = frame[column].to_numpy()[-width:] if column in frame else []
+        if len(values):
+            matrix[row, width - len(values) :] = values
+    return matrix
+
+
+def score_series(series_list, lookback=1, zscore_window=30):
+    # Ranking metrics for many PairSeries at once; the bar `lookback` bars back
+    # is the base for deltas and returns
+    def frames(metric):
+        return [
+            series.frame(metric) if metric in series else pd.DataFrame()
+            for series in series_list
+        ]
+
+    oi = tail_matrix(frames("open_interest_ohlc"), "c", lookback + 1)
+    close = tail_matrix(frames("price_ohlc"), "c", lookback + 1)
+    ratio = tail_matrix(
+        frames("top_long_short_account_ratio"), "longShortRatio", zscore_window
+    )
+    # Pairs missing a metric score NaN rather than warn
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        oi_delta = oi[:, -1] - oi[:, 0]
+        oi_change = oi_delta / oi[:, 0]
+        price_return = close[:, -1] / close[:, 0] - 1
+        long_short_zscore = (ratio[:, -1] - np.nanmean(ratio, axis=1)) / np.nanstd(
+            ratio, axis=1
+        )
+
+    times = []
+    for series in series_list:
+        metrics = series.metrics()
+        times.append(
+            max(series.latest_time(metric) for metric in metrics)
+            if metrics
+            else np.datetime64("NaT", "ms")
+        )
+    return pd.DataFrame(
+        {
+            "exchange": [series.exchange for series in series_list],
+            "pair": [series.pair for series in series_list],
+            "time": np.array(times, dtype="datetime64[ms]"),
+            "open_interest": oi[:, -1],
+            "oi_delta": oi_delta,
+            "oi_change": oi_change,
+            "price_return": price_return,
+            "long_short_ratio": ratio[:, -1],
+            "long_short_zscore": long_short_zscore,
+        },
+        columns=SCORE_COLUMNS,
+    )
+
+
+class Screener:
+    # Cross-sectional ranking over many instruments. Series are fetched through
+    # the client's store with incremental=True, so a sweep only downloads new
+    # bars, and only pairs whose newest bar changed are re-scored.
+    #
+    # A sweep over the whole universe takes as long as the rate limit allows,
+    # so the dashboard runs it on a background thread with start() and reads
+    # the latest table(). The lock is only held while ingesting and scoring.
+    def __init__(
+        self,
+        api,
+        catalog,
+        interval="h24",
+        limit=50,
+        lookback=1,
+        zscore_window=30,
+        max_workers=16,
+    ):
+        self.api = api
+        self.catalog = catalog
+        self.interval = interval
+        self.limit = limit
+        self.lookback = lookback
+        self.zscore_window = zscore_window
+        self.max_workers = max_workers
+        self.rescored = 0
+        # Epoch seconds the last sweep finished, and the progress of a running one
+        self.swept_at = None
+        self.progress = None
+        self._thread = None
+        self._lock = threading.Lock()
+        # (exchange, pair) -> PairSeries
+        self._series = {}
+        # (exchange, pair) -> newest bar time per metric when last scored
+        self._versions = {}
+        # (exchange, pair) -> score row
+        self._scores = {}
+        self.errors = {}
+
+    def universe(self, exchanges=None, quotes=None):
+        instruments = self.catalog.instruments()
+        if exchanges:
+            instruments = instruments[instruments["exchange"].isin(exchanges)]
+        if quotes:
+            instruments = instruments[instruments["quoteAsset"].isin(quotes)]
+        return list(zip(instruments["exchange"], instruments["instrumentId"]))
+
+    def _version(self, series):
+        return tuple(
+            (metric, series.latest_time(metric)) for metric in sorted(series.metrics())
+        )
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, pairs=None, refresh=False):
+        # Runs sweep() on a background thread unless one is already running;
+        # returns whether a sweep was started
+        with self._lock:
+            if self.running:
+                return False
+            self._thread = threading.Thread(
+                target=self._run, args=(pairs, refresh), daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def _run(self, pairs, refresh):
+        try:
+            self.sweep(pairs, refresh)
+        except Exception as err:
+            self.progress = None
+            print(f"Screener sweep failed: {err}")
+
+    def sweep(self, pairs=None, refresh=False):
+        pairs = list(dict.fromkeys(pairs if pairs is not None else self.universe()))
+        errors = {}
+        bulks = {}
+        for step, name in enumerate(SCREEN_FIELDS):
+            self.progress = (step, len(SCREEN_FIELDS), len(pairs))
+            bulks[name] = self.api.fetch_bulk(
+                pairs,
+                name,
+                interval=self.interval,
+                limit=self.limit,
+                max_workers=self.max_workers,
+                refresh=refresh,
+                incremental=True,
+            )
+            for key, err in bulks[name].attrs["errors"].items():
+                errors[(name,) + key] = err
+
+        with self._lock:
+            for name, bulk in bulks.items():
+                if bulk.empty:
+                    continue
+                metric = DashboardBundle.FIELD_METRICS[name]
+                for key, frame in bulk.groupby(["exchange", "pair"], observed=True):
+                    series = self._series.get(key)
+                    if series is None:
+                        series = self._series[key] = PairSeries(
+                            key[0], key[1], self.interval
+                        )
+                    series.ingest(metric, frame)
+
+            changed = []
+            for key in pairs:
+                series = self._series.get(key)
+                if series is None:
+                    continue
+                version = self._version(series)
+                if self._versions.get(key) != version:
+                    self._versions[key] = version
+                    changed.append(series)
+            if changed:
+                scores = score_series(changed, self.lookback, self.zscore_window)
+                for row in scores.to_dict("records"):
+                    self._scores[(row["exchange"], row["pair"])] = row
+            self.rescored = len(changed)
+            self.errors = errors
+            self.swept_at = time.time()
+            self.progress = None
+        return self.table(pairs)
+
+    def table(self, pairs=None, sort_by="oi_change", ascending=False):
+        with self._lock:
+            keys = list(self._scores) if pairs is None else pairs
+            rows = [self._scores[key] for key in keys if key in self._scores]
+        table = pd.DataFrame(rows, columns=SCORE_COLUMNS)
+        return table.sort_values(
+            sort_by, ascending=ascending, na_position="last", ignore_index=True
+        )
@@ -1,23 +1,625 @@
+import numpy as np
 import pandas as pd
 import requests
-import plotly.express as px
-import streamlit as st
-import plotly.graph_objects as go
+import functools
 import json
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from operator import itemgetter
+from typing import Dict, Optional
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
 
-# Load the configuration file
-with open("config.json") as config_file:
-    config = json.load(config_file)
+from candle_store import METRICS, VALUE_DTYPES
+from column_store import open_store
+from downsample import downsample_appending, downsample_line, downsample_ohlc
+from indicators import IndicatorEngine
+from timeseries import PairSeries
 
-# Use the API key from the configuration file
-coinglass_api_key = config["coinglassSecret"]
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+@dataclass
+class DashboardBundle:
+    ohlc_oi: Optional[pd.DataFrame] = None
+    price_ohlc: Optional[pd.DataFrame] = None
+    long_short_ratio: Optional[pd.DataFrame] = None
+    long_short_position_ratio: Optional[pd.DataFrame] = None
+    long_short_loser: Optional[pd.DataFrame] = None
+    # Seconds spent on each fetch, keyed by bundle field name
+    timings: Dict[str, float] = field(default_factory=dict)
+    # Exceptions raised by failed fetches, keyed by bundle field name
+    errors: Dict[str, Exception] = field(default_factory=dict)
+    # Every fetched metric aligned on one time index
+    series: PairSeries = field(default_factory=PairSeries)
+
+    # Bundle field name -> metric name in METRICS
+    FIELD_METRICS = {
+        "ohlc_oi": "open_interest_ohlc",
+        "price_ohlc": "price_ohlc",
+        "long_short_ratio": "top_long_short_account_ratio",
+        "long_short_position_ratio": "top_long_short_position_ratio",
+        "long_short_loser": "long_short_accounts",
+    }
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def add(self, name, frame):
+        setattr(self, name, frame)
+        self.series.ingest(self.FIELD_METRICS[name], frame)
+
+
+@dataclass
+class AggregatedView:
+    # Per bar: t, total_oi, vwap (volume-weighted close across exchanges)
+    totals: Optional[pd.DataFrame] = None
+    # Per exchange and bar: t, exchange, oi, share of total_oi
+    by_exchange: Optional[pd.DataFrame] = None
+    # Exceptions raised by failed fetches, keyed by (metric, exchange, pair)
+    errors: Dict[tuple, Exception] = field(default_factory=dict)
+
+
+class ConnectionStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_new_connection(self):
+        with self._lock:
+            self.new_connections += 1
+
+    @property
+    def reused_connections(self):
+        return max(self.requests - self.new_connections, 0)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": self.reused_connections,
+            }
+
+
+def _counting_pool_class(pool_class, stats):
+    # urllib3 calls _new_conn only when no idle keep-alive connection is available
+    class CountingConnectionPool(pool_class):
+        def _new_conn(self):
+            stats.record_new_connection()
+            return super()._new_conn()
+
+    return CountingConnectionPool
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    def __init__(self, stats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool_class(HTTPConnectionPool, self.stats),
+            "https": _counting_pool_class(HTTPSConnectionPool, self.stats),
+        }
+
+    def send(self, request, **kwargs):
+        self.stats.record_request()
+        return super().send(request, **kwargs)
+
+
+class PooledSession(requests.Session):
+    # pool_connections: number of per-host pools kept alive
+    # pool_maxsize: keep-alive connections kept per host
+    # pool_block: wait for a free connection instead of exceeding pool_maxsize
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False):
+        super().__init__()
+        self.stats = ConnectionStats()
+        adapter = PooledHTTPAdapter(
+            self.stats,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.headers["Connection"] = "keep-alive"
+
+
+# Length in seconds of each CoinGlass interval code
+INTERVAL_SECONDS = {
+    "m1": 60,
+    "m5": 300,
+    "m15": 900,
+    "m30": 1800,
+    "h1": 3600,
+    "h2": 7200,
+    "h4": 14400,
+    "h6": 21600,
+    "h8": 28800,
+    "h12": 43200,
+    "h24": 86400,
+}
+
+
+class ResponseCache:
+    # Any object with get(endpoint, params) and set(endpoint, params, payload)
+    # can be handed to CoinGlassAPI in place of this in-memory implementation.
+    def __init__(
+        self, max_entries=512, default_ttl=60, ttl_fraction=1 / 12, endpoint_ttls=None
+    ):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        # Interval-based endpoints are kept for this fraction of one bar, so
+        # h24 candles live two hours while h1 candles live five minutes
+        self.ttl_fraction = ttl_fraction
+        self.endpoint_ttls = {"/public/v2/instrument": 3600, **(endpoint_ttls or {})}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(endpoint, params):
+        return endpoint, tuple(sorted((params or {}).items()))
+
+    def ttl_for(self, endpoint, params):
+        if endpoint in self.endpoint_ttls:
+            return self.endpoint_ttls[endpoint]
+        interval_seconds = INTERVAL_SECONDS.get((params or {}).get("interval"))
+        if interval_seconds is None:
+            return self.default_ttl
+        return max(interval_seconds * self.ttl_fraction, self.default_ttl)
+
+    def get(self, endpoint, params):
+        key = self.make_key(endpoint, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, payload = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def set(self, endpoint, params, payload):
+        key = self.make_key(endpoint, params)
+        expires_at = time.monotonic() + self.ttl_for(endpoint, params)
+        with self._lock:
+            self._entries[key] = (expires_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class SingleFlight:
+    # Concurrent callers asking for the same key share one execution of the work
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {"done": threading.Event()}
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call["done"].wait()
+            if "error" in call:
+                raise call["error"]
+            return call["result"]
+
+        try:
+            call["result"] = fn()
+            return call["result"]
+        except Exception as err:
+            call["error"] = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call["done"].set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+            }
+
+
+JSON_BACKENDS = ("orjson", "msgspec", "stdlib")
+
+
+def get_json_decoder(backend="auto"):
+    # Returns a callable decoding response bytes; "auto" picks the fastest installed
+    if backend == "auto":
+        backend = "orjson" if orjson else "msgspec" if msgspec else "stdlib"
+    if backend == "orjson":
+        if orjson is None:
+            raise ImportError("The orjson JSON backend requires: pip install orjson")
+        return orjson.loads
+    if backend == "msgspec":
+        if msgspec is None:
+            raise ImportError("The msgspec JSON backend requires: pip install msgspec")
+        return msgspec.json.Decoder().decode
+    if backend == "stdlib":
+        return json.loads
+    raise ValueError(
+        f"Unknown JSON backend {backend!r}, expected one of {JSON_BACKENDS}"
+    )
+
+
+# Responses worth retrying: throttling and transient upstream failures
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    # Token bucket refilled at requests_per_minute, holding at most `burst` tokens
+    def __init__(self, requests_per_minute=30, burst=None):
+        self._lock = threading.Lock()
+        self.set_rate(requests_per_minute, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.acquired = 0
+        self.throttled = 0
+        self.retries = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def set_rate(self, requests_per_minute, burst=None):
+        with self._lock:
+            self.requests_per_minute = requests_per_minute
+            self.rate = requests_per_minute / 60
+            self.capacity = burst or min(requests_per_minute, 10)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self):
+        # Takes a token now and returns how long the caller must wait before
+        # using it, so sync and async callers can sleep in their own way
+        with self._lock:
+            self._refill()
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            self.acquired += 1
+            if wait:
+                self.throttled += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            return wait
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def pause(self, seconds):
+        # Holds every caller sharing this bucket back for at least `seconds`
+        with self._lock:
+            self._refill()
+            # Concurrent 429s overlap: the longest pause wins, they do not add up
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "retries": self.retries,
+                "throttle_wait_seconds": self.total_wait,
+                "max_wait_seconds": self.max_wait,
+            }
+
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(api_key, requests_per_minute=30, burst=None):
+    # CoinGlass enforces its plan limit per key, so every client using the same
+    # key in this process draws from the same bucket
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(api_key)
+        if limiter is None:
+            limiter = _rate_limiters[api_key] = RateLimiter(requests_per_minute, burst)
+        elif limiter.requests_per_minute != requests_per_minute:
+            limiter.set_rate(requests_per_minute, burst)
+        return limiter
+
+
+def retry_delay(retry_after, attempt, backoff_base=1.0, backoff_cap=30.0):
+    # Jittered exponential backoff that never undercuts the server's Retry-After
+    delay = random.uniform(0, min(backoff_cap, backoff_base * 2**attempt))
+    if retry_after:
+        try:
+            delay = max(delay, float(retry_after))
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(retry_after).timestamp()
+                delay = max(delay, retry_at - time.time())
+            except (TypeError, ValueError):
+                pass
+    return delay
+
+
+# Largest limit the CoinGlass indicator endpoints accept
+API_MAX_LIMIT = 4500
+
+
+def top_up_limit(latest, metric, interval, limit, stored_rows=None):
+    # Number of bars to request so a stored series whose newest bar opened at
+    # `latest` is brought up to date, and holds at least `limit` bars
+    interval_seconds = INTERVAL_SECONDS.get(interval)
+    if latest is None or interval_seconds is None:
+        return limit
+    if METRICS[metric]["unit"] == "ms":
+        latest /= 1000
+    # Bars opened since the latest stored one, plus that bar itself since it
+    # may still have been forming when it was stored
+    new_bars = int((time.time() - latest) // interval_seconds) + 1
+    if new_bars > API_MAX_LIMIT:
+        print(
+            f"{metric} {interval}: {new_bars} bars since the stored history, "
+            f"fetching the newest {API_MAX_LIMIT}; older missing bars stay a gap"
+        )
+    if stored_rows is not None and stored_rows < limit:
+        new_bars = max(new_bars, limit)
+    # Gaps longer than `limit` are fetched whole so the store has no holes
+    return min(max(new_bars, 1), API_MAX_LIMIT)
+
+
+def available_pairs_frame(data, coin):
+    pairs = []
+    for exchange, instruments in data["data"].items():
+        for item in instruments:
+            if coin.upper() in [
+                item["baseAsset"].upper(),
+                item["quoteAsset"].upper(),
+            ]:
+                pairs.append(
+                    {"exchange": exchange, "instrumentId": item["instrumentId"]}
+                )
+
+    return pd.DataFrame(pairs)
+
+
+def decode_rows(rows, metric):
+    # Turns the JSON "data" rows of an endpoint into one NumPy array per schema
+    # column: epoch int64 timestamps followed by the typed value columns
+    spec = METRICS[metric]
+    names = [spec["time"]] + spec["columns"]
+    if not rows:
+        values = np.empty((0, len(names)))
+        present = names
+    elif isinstance(rows[0], dict):
+        present = [name for name in names if name in rows[0]]
+        getter = itemgetter(*present)
+        if len(present) == 1:
+            values = np.array([[getter(row)] for row in rows], dtype=np.float64)
+        else:
+            values = np.array([getter(row) for row in rows], dtype=np.float64)
+    else:
+        # Positional rows, e.g. price_ohlc's [t, o, h, l, c, v]
+        present = names[: len(rows[0])]
+        values = np.array(rows, dtype=np.float64)[:, : len(present)]
+
+    columns = {spec["time"]: values[:, 0].astype(np.int64)}
+    for name in spec["columns"]:
+        if name in present:
+            columns[name] = values[:, present.index(name)].astype(VALUE_DTYPES[metric])
+        else:
+            columns[name] = np.full(len(values), np.nan, dtype=VALUE_DTYPES[metric])
+    return columns
+
+
+def decode_frame(columns, metric):
+    # Newest bar first, with the timestamp as datetime64 at the API's resolution
+    spec = METRICS[metric]
+    times = np.asarray(columns[spec["time"]], dtype=np.int64)
+    if np.all(times[1:] > times[:-1]):
+        # Already ascending, as store reads are: a reversed view avoids copying
+        # memory-mapped columns
+        order = slice(None, None, -1)
+    else:
+        order = np.argsort(times, kind="stable")[::-1]
+    data = {spec["time"]: times[order].view(f"datetime64[{spec['unit']}]")}
+    for name in spec["columns"]:
+        data[name] = np.asarray(columns[name], dtype=VALUE_DTYPES[metric])[order]
+    return pd.DataFrame(data, copy=False)
+
+
+def bulk_matrix(bulk, column, exchanges, times, interval):
+    # Scatters one column of a fetch_bulk frame into an exchanges x times matrix,
+    # with timestamps floored to the interval so venues' bars line up
+    matrix = np.full((len(exchanges), len(times)), np.nan)
+    if bulk.empty:
+        return matrix
+    rows = pd.Categorical(bulk["exchange"], categories=exchanges).codes
+    stamps = bulk.iloc[:, 2].to_numpy().astype("datetime64[ms]").astype(np.int64)
+    stamps -= stamps % (INTERVAL_SECONDS[interval] * 1000)
+    cols = np.searchsorted(times, stamps)
+    keep = (rows >= 0) & (cols < len(times))
+    keep[keep] = times[cols[keep]] == stamps[keep]
+    matrix[rows[keep], cols[keep]] = bulk[column].to_numpy()[keep]
+    return matrix
+
+
+def aggregate_exchanges(oi, price, interval):
+    # oi and price are fetch_bulk frames for "ohlc_oi" and "price_ohlc"
+    exchanges = sorted(set(oi["exchange"]) if not oi.empty else [])
+    stamps = np.empty(0, dtype=np.int64)
+    if not oi.empty:
+        stamps = oi.iloc[:, 2].to_numpy().astype("datetime64[ms]").astype(np.int64)
+        stamps = stamps - stamps % (INTERVAL_SECONDS[interval] * 1000)
+    times = np.unique(stamps)
+
+    open_interest = bulk_matrix(oi, "c", exchanges, times, interval)
+    close = bulk_matrix(price, "c", exchanges, times, interval)
+    volume = bulk_matrix(price, "v", exchanges, times, interval)
+
+    total_oi = np.nansum(open_interest, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        share = open_interest / total_oi
+        traded = ~np.isnan(close) & ~np.isnan(volume)
+        vwap = np.where(traded, close * volume, 0).sum(axis=0) / np.where(
+            traded, volume, 0
+        ).sum(axis=0)
+
+    timestamps = times.astype("datetime64[ms]")
+    totals = pd.DataFrame({"t": timestamps, "total_oi": total_oi, "vwap": vwap})
+    present = ~np.isnan(open_interest.ravel())
+    by_exchange = pd.DataFrame(
+        {
+            "t": np.tile(timestamps, len(exchanges))[present],
+            "exchange": pd.Categorical.from_codes(
+                np.repeat(np.arange(len(exchanges)), len(times))[present], exchanges
+            ),
+            "oi": open_interest.ravel()[present],
+            "share": share.ravel()[present],
+        }
+    )
+    return AggregatedView(totals=totals, by_exchange=by_exchange)
 
 
 class CoinGlassAPI:
-    def __init__(self, api_key):
+    # Bundle field name -> fetch method, in dashboard display order
+    DASHBOARD_FETCHES = {
+        "ohlc_oi": "fetch_ohlc_oi_data",
+        "price_ohlc": "fetch_price_ohlc_data",
+        "long_short_ratio": "fetch_top_long_short_ratio",
+        "long_short_position_ratio": "fetch_top_long_short_position_ratio",
+        "long_short_loser": "fetch_top_long_short_loser",
+    }
+
+    def __init__(
+        self,
+        api_key,
+        session=None,
+        pool_connections=10,
+        pool_maxsize=10,
+        pool_block=False,
+        cache=None,
+        store=None,
+        requests_per_minute=30,
+        max_retries=4,
+        backoff_base=1.0,
+        backoff_cap=30.0,
+        json_backend="auto",
+        base_url="https://open-api.coinglass.com",
+        store_max_age=None,
+        timeout=(5, 30),
+    ):
         self.api_key = api_key
-        self.base_url = "https://open-api.coinglass.com"
+        self.base_url = base_url
+        # Seconds to connect / to wait for data; requests are coalesced, so one
+        # stuck connection would otherwise hang every caller waiting on it
+        self.timeout = timeout
         self.headers = self._get_headers()
+        # A session passed in is shared with other clients and left open on close()
+        self._owns_session = session is None
+        self.session = session or PooledSession(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.cache = cache
+        # CandleStore or ColumnStore backing incremental fetches, see _fetch_columns
+        self.store = store
+        # Incremental fetches of series written to the store within this many
+        # seconds (e.g. by poller.py) are served locally without a request
+        self.store_max_age = store_max_age
+        # requests_per_minute should match the CoinGlass plan; None disables limiting
+        self.rate_limiter = (
+            get_rate_limiter(api_key, requests_per_minute)
+            if requests_per_minute
+            else None
+        )
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.json_loads = get_json_decoder(json_backend)
+        self.single_flight = SingleFlight()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self._owns_session:
+            self.session.close()
+
+    def connection_stats(self):
+        stats = getattr(self.session, "stats", None)
+        return stats.snapshot() if stats is not None else {}
+
+    def rate_limit_stats(self):
+        return self.rate_limiter.stats() if self.rate_limiter is not None else {}
+
+    def coalescing_stats(self):
+        return self.single_flight.stats()
 
     def _get_headers(self):
         return {
@@ -25,12 +627,62 @@ class CoinGlassAPI:
             "coinglassSecret": self.api_key,
         }
 
-    def _request(self, endpoint, params=None):
+    def _request(self, endpoint, params=None, refresh=False):
+        # refresh skips the cache lookup but still stores the fresh response
+        if self.cache is not None and not refresh:
+            cached = self.cache.get(endpoint, params)
+            if cached is not None:
+                return cached
+
+        # Identical requests already in flight are joined rather than re-sent
+        return self.single_flight.do(
+            ResponseCache.make_key(endpoint, params),
+            lambda: self._send(endpoint, params),
+        )
+
+    def _send(self, endpoint, params):
         url = f"{self.base_url}{endpoint}"
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            response = self.session.get(
+                url, headers=self.headers, params=params, timeout=self.timeout
+            )
+            if (
+                response.status_code not in RETRY_STATUSES
+                or attempt >= self.max_retries
+            ):
+                break
+            delay = retry_delay(
+                response.headers.get("Retry-After"),
+                attempt,
+                self.backoff_base,
+                self.backoff_cap,
+            )
+            print(
+                f"HTTP {response.status_code} from {endpoint}, "
+                f"retrying in {delay:.1f}s"
+            )
+            response.close()
+            if self.rate_limiter is None:
+                time.sleep(delay)
+            else:
+                self.rate_limiter.record_retry()
+                if response.status_code == 429:
+                    # Back off every caller sharing the key, not just this one;
+                    # the next acquire() does the waiting
+                    self.rate_limiter.pause(delay)
+                else:
+                    time.sleep(delay)
+            attempt += 1
+
         try:
-            response = requests.get(url, headers=self.headers, params=params)
             response.raise_for_status()
-            return response.json()
+            data = self.json_loads(response.content)
+            if self.cache is not None and data.get("success", True) is not False:
+                self.cache.set(endpoint, params, data)
+            return data
         except requests.exceptions.HTTPError as e:
             error_msg = (
                 f"HTTP error occurred: {e.response.status_code} {e.response.reason}"
@@ -44,62 +696,123 @@ class CoinGlassAPI:
 
             raise e
 
-    def get_available_pairs(self, coin):
+    def get_available_pairs(self, coin, refresh=False):
         endpoint = "/public/v2/instrument"
         params = {"symbol": coin}
-        data = self._request(endpoint, params=params)
-        pairs = []
-        for exchange, instruments in data["data"].items():
-            for item in instruments:
-                if coin.upper() in [
-                    item["baseAsset"].upper(),
-                    item["quoteAsset"].upper(),
-                ]:
-                    pairs.append(
-                        {"exchange": exchange, "instrumentId": item["instrumentId"]}
-                    )
+        data = self._request(endpoint, params=params, refresh=refresh)
+        return available_pairs_frame(data, coin)
+
+    def _fetch_columns(
+        self,
+        endpoint,
+        exchange,
+        pair,
+        interval,
+        limit,
+        refresh=False,
+        incremental=False,
+    ):
+        metric = endpoint.rsplit("/", 1)[-1]
+        params = {"ex": exchange, "pair": pair, "interval": interval, "limit": limit}
+        if not incremental or self.store is None:
+            request = self._request(endpoint, params=params, refresh=refresh)
+            return decode_rows(request["data"], metric)
+
+        stored_rows = self.store.row_count(exchange, pair, interval, metric)
+        if self.store_max_age is not None and not refresh:
+            updated = self.store.last_updated(exchange, pair, interval, metric)
+            if (
+                updated is not None
+                and time.time() - updated <= self.store_max_age
+                and stored_rows >= limit
+            ):
+                stored = self.store.read(exchange, pair, interval, metric)
+                return {name: stored[name].to_numpy() for name in stored.columns}
+
+        # Only request bars newer than what is stored (or `limit` bars while fewer
+        # are stored), then serve the full history
+        latest = self.store.latest_timestamp(exchange, pair, interval, metric)
+        params["limit"] = top_up_limit(latest, metric, interval, limit, stored_rows)
+        try:
+            request = self._request(endpoint, params=params, refresh=refresh)
+            self.store.upsert(
+                exchange,
+                pair,
+                interval,
+                metric,
+                pd.DataFrame(decode_rows(request["data"], metric), copy=False),
+            )
+        except requests.exceptions.RequestException as err:
+            if latest is None:
+                raise
+            print(f"Top-up of {metric} failed, serving stored history: {err}")
 
-        return pd.DataFrame(pairs)
+        stored = self.store.read(exchange, pair, interval, metric)
+        return {name: stored[name].to_numpy() for name in stored.columns}
+
+    def fetch_page(
+        self, metric, exchange, pair, interval="h24", limit=500, end_time=None
+    ):
+        # Raw columns of up to `limit` bars of a METRICS series, the newest one
+        # opening at or before end_time (epoch ms); used to page back in history
+        params = {"ex": exchange, "pair": pair, "interval": interval, "limit": limit}
+        if end_time is not None:
+            params["endTime"] = int(end_time)
+        request = self._request(f"/public/v2/indicator/{metric}", params=params)
+        return decode_rows(request["data"], metric)
+
+    def get_instruments(self, refresh=False):
+        endpoint = "/public/v2/instrument"
+        data = self._request(endpoint, refresh=refresh)
+        instruments = [
+            {
+                "exchange": exchange,
+                "instrumentId": item["instrumentId"],
+                "baseAsset": item["baseAsset"].upper(),
+                "quoteAsset": item["quoteAsset"].upper(),
+            }
+            for exchange, items in data["data"].items()
+            for item in items
+        ]
+        return pd.DataFrame(
+            instruments, columns=["exchange", "instrumentId", "baseAsset", "quoteAsset"]
+        )
 
-    def fetch_ohlc_oi_data(self, exchange, pair):
+    def fetch_ohlc_oi_data(
+        self, exchange, pair, interval="h24", limit=50, refresh=False, incremental=False
+    ):
         endpoint = "/public/v2/indicator/open_interest_ohlc"
-        params = {
-            "ex": exchange,
-            "pair": pair,
-            "interval": "h24",
-            "limit": 50,
-        }
         try:
-            request = self._request(endpoint, params=params)
-            df = pd.DataFrame(request["data"])
-            df["t"] = pd.to_datetime(df["t"], unit="ms").dt.date
-            df = df.sort_values("t", ascending=False)
-            return df
+            columns = self._fetch_columns(
+                endpoint, exchange, pair, interval, limit, refresh, incremental
+            )
+            return decode_frame(columns, "open_interest_ohlc")
         except requests.exceptions.HTTPError as err:
             print(f"HTTP error occurred: {err}")
             raise
 
-    def fetch_price_ohlc_data(self, exchange, pair, interval="h24", limit=50):
+    def fetch_price_ohlc_data(
+        self, exchange, pair, interval="h24", limit=50, refresh=False, incremental=False
+    ):
         endpoint = "/public/v2/indicator/price_ohlc"
-        params = {"ex": exchange, "pair": pair, "interval": interval, "limit": limit}
         try:
-            request = self._request(endpoint, params=params)
-            df = pd.DataFrame(request["data"], columns=["t", "o", "h", "l", "c", "v"])
-            df["t"] = pd.to_datetime(df["t"], unit="s").dt.date
-            df = df.sort_values("t", ascending=False)
-            return df
+            columns = self._fetch_columns(
+                endpoint, exchange, pair, interval, limit, refresh, incremental
+            )
+            return decode_frame(columns, "price_ohlc")
         except requests.exceptions.HTTPError as err:
             print(f"HTTP error occurred: {err}")
             raise
 
-    def fetch_top_long_short_ratio(self, exchange, pair, interval="h24", limit=50):
+    def fetch_top_long_short_ratio(
+        self, exchange, pair, interval="h24", limit=50, refresh=False, incremental=False
+    ):
         endpoint = "/public/v2/indicator/top_long_short_account_ratio"
-        params = {"ex": exchange, "pair": pair, "interval": interval, "limit": limit}
         try:
-            request = self._request(endpoint, params=params)
-            df = pd.DataFrame(request["data"])
-            df["createTime"] = pd.to_datetime(df["createTime"], unit="ms")
-            df = df.sort_values("createTime", ascending=False)
+            columns = self._fetch_columns(
+                endpoint, exchange, pair, interval, limit, refresh, incremental
+            )
+            df = decode_frame(columns, "top_long_short_account_ratio")
         except requests.exceptions.HTTPError as err:
             print(f"HTTP error occured: {err}")
             raise
@@ -107,193 +820,996 @@ class CoinGlassAPI:
         return df
 
     def fetch_top_long_short_position_ratio(
-        self, exchange, pair, interval="h24", limit=50
+        self, exchange, pair, interval="h24", limit=50, refresh=False, incremental=False
     ):
         endpoint = "/public/v2/indicator/top_long_short_position_ratio"
-        params = {"ex": exchange, "pair": pair, "interval": interval, "limit": limit}
         try:
-            request = self._request(endpoint, params=params)
-            df = pd.DataFrame(request["data"])
-            df["createTime"] = pd.to_datetime(df["createTime"], unit="ms")
-            df = df.sort_values("createTime", ascending=False)
+            columns = self._fetch_columns(
+                endpoint, exchange, pair, interval, limit, refresh, incremental
+            )
+            df = decode_frame(columns, "top_long_short_position_ratio")
         except requests.exceptions.HTTPError as err:
             print(f"HTTP error occured: {err}")
             raise
 
         return df
 
-    def fetch_top_long_short_loser(self, exchange, pair, interval="h24", limit=50):
+    def fetch_top_long_short_loser(
+        self, exchange, pair, interval="h24", limit=50, refresh=False, incremental=False
+    ):
         endpoint = "/public/v2/indicator/long_short_accounts"
-        params = {"ex": exchange, "pair": pair, "interval": interval, "limit": limit}
         try:
-            request = self._request(endpoint, params=params)
-            df = pd.DataFrame(request["data"])
-            df["createTime"] = pd.to_datetime(df["createTime"], unit="ms")
-            df = df.sort_values("createTime", ascending=False)
+            columns = self._fetch_columns(
+                endpoint, exchange, pair, interval, limit, refresh, incremental
+            )
+            df = decode_frame(columns, "long_short_accounts")
         except requests.exceptions.HTTPError as err:
             print(f"HTTP error occured: {err}")
             raise
 
         return df
 
+    def fetch_dashboard_bundle(
+        self,
+        exchange,
+        pair,
+        interval="h24",
+        limit=50,
+        max_workers=None,
+        refresh=False,
+        incremental=False,
+    ):
+        bundle = DashboardBundle(series=PairSeries(exchange, pair, interval))
+
+        def timed_fetch(name, method):
+            start = time.perf_counter()
+            try:
+                return getattr(self, method)(
+                    exchange,
+                    pair,
+                    interval=interval,
+                    limit=limit,
+                    refresh=refresh,
+                    incremental=incremental,
+                )
+            finally:
+                bundle.timings[name] = time.perf_counter() - start
+
+        # Issue every dashboard request at once so the total latency is roughly
+        # that of the slowest endpoint instead of the sum of all of them
+        with ThreadPoolExecutor(
+            max_workers=max_workers or len(self.DASHBOARD_FETCHES)
+        ) as executor:
+            futures = {
+                name: executor.submit(timed_fetch, name, method)
+                for name, method in self.DASHBOARD_FETCHES.items()
+            }
+            for name, future in futures.items():
+                try:
+                    bundle.add(name, future.result())
+                except Exception as err:
+                    print(f"Failed to fetch {name}: {err}")
+                    bundle.errors[name] = err
+
+        return bundle
+
+    def fetch_bulk(
+        self,
+        pairs,
+        metric,
+        interval="h24",
+        limit=50,
+        max_workers=8,
+        refresh=False,
+        incremental=False,
+    ):
+        # metric is a DashboardBundle field name, e.g. "price_ohlc" or "ohlc_oi"
+        method = getattr(self, self.DASHBOARD_FETCHES[metric])
+        pairs = list(pairs)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    method,
+                    exchange,
+                    pair,
+                    interval=interval,
+                    limit=limit,
+                    refresh=refresh,
+                    incremental=incremental,
+                )
+                for exchange, pair in pairs
+            ]
+            fetched = []
+            frames = []
+            errors = {}
+            for (exchange, pair), future in zip(pairs, futures):
+                try:
+                    frames.append(future.result())
+                    fetched.append((exchange, pair))
+                except Exception as err:
+                    print(f"Failed to fetch {metric} for {exchange} {pair}: {err}")
+                    errors[(exchange, pair)] = err
+
+        if not frames:
+            result = pd.DataFrame(columns=["exchange", "pair"])
+        else:
+            # One concat at the end, with the labels attached as categorical codes
+            # repeated per frame rather than a string column per frame
+            result = pd.concat(frames, ignore_index=True)
+            lengths = [len(frame) for frame in frames]
+            for position, column in enumerate(["exchange", "pair"]):
+                labels = pd.Categorical([key[position] for key in fetched])
+                result.insert(
+                    position,
+                    column,
+                    pd.Categorical.from_codes(
+                        np.repeat(labels.codes, lengths), labels.categories
+                    ),
+                )
+        result.attrs["errors"] = errors
+        return result
+
+    def fetch_aggregate(
+        self, pairs, interval="h24", limit=50, max_workers=16, refresh=False
+    ):
+        # pairs holds one (exchange, pair) per exchange, e.g. from
+        # InstrumentCatalog.primary_pairs
+        pairs = list(pairs)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            oi, price = executor.map(
+                lambda metric: self.fetch_bulk(
+                    pairs,
+                    metric,
+                    interval=interval,
+                    limit=limit,
+                    max_workers=max_workers,
+                    refresh=refresh,
+                ),
+                ["ohlc_oi", "price_ohlc"],
+            )
+        view = aggregate_exchanges(oi, price, interval)
+        for metric, bulk in [("ohlc_oi", oi), ("price_ohlc", price)]:
+            for (exchange, pair), err in bulk.attrs["errors"].items():
+                view.errors[(metric, exchange, pair)] = err
+        return view
+
+
+class InstrumentCatalog:
+    # Whole instrument universe held in memory with hash indexes, so resolving a
+    # coin or exchange to its pairs never touches the network
+    def __init__(self, api, refresh_interval=3600):
+        self.api = api
+        self.refresh_interval = refresh_interval
+        self.loaded_at = None
+        self._lock = threading.Lock()
+        self._instruments = pd.DataFrame(
+            columns=["exchange", "instrumentId", "baseAsset", "quoteAsset"]
+        )
+        self._by_base = {}
+        self._by_quote = {}
+        self._by_exchange = {}
+        self._pairs_cache = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def refresh(self):
+        instruments = self.api.get_instruments(refresh=True)
+        # Row positions of each key, built once per refresh
+        by_base = instruments.groupby("baseAsset").indices
+        by_quote = instruments.groupby("quoteAsset").indices
+        by_exchange = instruments.groupby("exchange").indices
+        with self._lock:
+            self._instruments = instruments
+            self._by_base = by_base
+            self._by_quote = by_quote
+            self._by_exchange = by_exchange
+            self._pairs_cache = {}
+            self.loaded_at = time.monotonic()
+
+    def start(self):
+        # Load once up front, then refresh in a daemon thread so lookups never
+        # wait on the network
+        if self.loaded_at is None:
+            self.refresh()
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except requests.exceptions.RequestException as err:
+                print(f"Instrument catalog refresh failed: {err}")
+
+    def _ensure_fresh(self):
+        stale = (
+            self.loaded_at is None
+            or time.monotonic() - self.loaded_at > self.refresh_interval
+        )
+        # The background thread handles staleness once the first load is done
+        if self.loaded_at is not None and (
+            not stale or (self._thread is not None and self._thread.is_alive())
+        ):
+            return
+        try:
+            self.refresh()
+        except requests.exceptions.RequestException as err:
+            if self.loaded_at is None:
+                raise
+            print(f"Instrument catalog refresh failed, serving stale data: {err}")
+
+    def exchanges(self):
+        self._ensure_fresh()
+        return list(self._by_exchange)
+
+    def instruments(self):
+        self._ensure_fresh()
+        return self._instruments
+
+    def instrument(self, exchange, instrument_id):
+        self._ensure_fresh()
+        with self._lock:
+            positions = self._by_exchange.get(exchange, [])
+            rows = self._instruments.iloc[positions]
+        match = rows[rows["instrumentId"] == instrument_id]
+        return None if match.empty else match.iloc[0].to_dict()
+
+    def pairs_for(self, coin, exchange=None):
+        coin = coin.upper()
+        self._ensure_fresh()
+        with self._lock:
+            key = (coin, exchange)
+            frame = self._pairs_cache.get(key)
+            if frame is None:
+                positions = np.union1d(
+                    self._by_base.get(coin, []), self._by_quote.get(coin, [])
+                ).astype(int)
+                if exchange is not None:
+                    positions = np.intersect1d(
+                        positions, self._by_exchange.get(exchange, [])
+                    ).astype(int)
+                frame = self._instruments.iloc[positions][
+                    ["exchange", "instrumentId"]
+                ].reset_index(drop=True)
+                self._pairs_cache[key] = frame
+            return frame
+
+    def primary_pairs(self, coin, quotes=("USDT", "USD", "BUSD", "USDC")):
+        # One (exchange, instrumentId) per exchange listing coin as its base,
+        # taking the first quote in quotes the exchange lists
+        coin = coin.upper()
+        self._ensure_fresh()
+        with self._lock:
+            listed = self._instruments.iloc[self._by_base.get(coin, [])]
+        listed = listed[listed["quoteAsset"].isin(quotes)]
+        rank = listed["quoteAsset"].map({quote: i for i, quote in enumerate(quotes)})
+        first = listed.assign(rank=rank).sort_values(
+            ["exchange", "rank"], kind="stable"
+        )
+        first = first.drop_duplicates("exchange")
+        return list(zip(first["exchange"], first["instrumentId"]))
+
 
 ################################################################################################################
 
 
+# Plotly is imported by the plot_* methods on first use, so importing the client
+# from a batch job or notebook does not load it
 class CoinGlassPlotter:
+    # Points per chart, about the pixel width of a dashboard column. Longer
+    # frames are downsampled: LTTB for lines, merged candles for OHLC.
+    MAX_POINTS = 1000
+    # render_mode of the line charts: "svg", or "webgl" to draw them as
+    # Scattergl traces, which stay responsive with long or overlaid series.
+    # Plotly has no WebGL candlestick, so candles are always SVG.
+    RENDER_MODES = ("svg", "webgl")
+    # Figures are copied from a skeleton built once per chart type, title and
+    # render mode, then given their data by the matching update_* method; px
+    # reshaping the frame and plotly validating the layout cost far more than
+    # the copy
+    CACHE_SKELETONS = True
+    _skeletons = {}
+    _skeletons_lock = threading.Lock()
+
+    @staticmethod
+    def _from_skeleton(key, build, update, df, max_points):
+        import plotly.graph_objects as go
+
+        if df.empty:
+            return build(df)
+        if not CoinGlassPlotter.CACHE_SKELETONS:
+            return update(build(df.head(1)), df, max_points)
+        with CoinGlassPlotter._skeletons_lock:
+            skeleton = CoinGlassPlotter._skeletons.get(key)
+        if skeleton is None:
+            # px needs a row to create the traces; update replaces it
+            skeleton = build(df.head(1)).to_dict()
+            with CoinGlassPlotter._skeletons_lock:
+                CoinGlassPlotter._skeletons[key] = skeleton
+        # The skeleton was validated when it was built, so copies skip it
+        return update(go.Figure(skeleton, _validate=False), df, max_points)
+
     @staticmethod
-    def plot_closing_prices(df, title):
-        fig = px.line(
-            df, x="t", y="c", title=title, labels={"c": "Closing Price", "t": "Date"}
+    def plot_closing_prices(df, title, max_points=MAX_POINTS, render_mode="svg"):
+        import plotly.express as px
+
+        def build(df):
+            return px.line(
+                df,
+                x="t",
+                y="c",
+                title=title,
+                labels={"c": "Closing Price", "t": "Date"},
+                render_mode=render_mode,
+            )
+
+        return CoinGlassPlotter._from_skeleton(
+            ("closing_prices", title, render_mode),
+            build,
+            CoinGlassPlotter.update_closing_prices,
+            df,
+            max_points,
         )
-        return fig
 
     @staticmethod
-    def plot_candlestick_chart(df, title="OHLC Candlestick Chart"):
-        fig = go.Figure(
-            data=[
-                go.Candlestick(
-                    x=df["t"], open=df["o"], high=df["h"], low=df["l"], close=df["c"]
-                )
-            ],
-            layout=go.Layout(
+    def plot_candlestick_chart(
+        df, title="OHLC Candlestick Chart", max_points=MAX_POINTS
+    ):
+        import plotly.graph_objects as go
+
+        def build(df):
+            return go.Figure(
+                data=[
+                    go.Candlestick(
+                        x=df["t"],
+                        open=df["o"],
+                        high=df["h"],
+                        low=df["l"],
+                        close=df["c"],
+                    )
+                ],
+                layout=go.Layout(
+                    title=title,
+                    xaxis_title="Date",
+                    yaxis_title="Price",
+                    xaxis_rangeslider_visible=False,
+                ),
+            )
+
+        return CoinGlassPlotter._from_skeleton(
+            ("candlestick_chart", title),
+            build,
+            CoinGlassPlotter.update_candlestick_chart,
+            df,
+            max_points,
+        )
+
+    @staticmethod
+    def plot_long_short_ratios(
+        df, title="Top Traders Accounts Ratio", max_points=MAX_POINTS, render_mode="svg"
+    ):
+        import plotly.express as px
+
+        def build(df):
+            fig = px.line(
+                df,
+                x="createTime",
+                y=["longRatio", "shortRatio"],
                 title=title,
-                xaxis_title="Date",
-                yaxis_title="Price",
-                xaxis_rangeslider_visible=False,
+                labels={
+                    "createTime": "Date",
+                    "variable": "Ratio Type",
+                    "value": "Ratio (%)",
+                },
+                color_discrete_sequence=["green", "red"],
+                render_mode=render_mode,
+            )
+            fig.update_layout(yaxis=dict(range=[0, 100], dtick=10, title="Percentage"))
+            return fig
+
+        return CoinGlassPlotter._from_skeleton(
+            ("long_short_ratios", title, render_mode),
+            build,
+            CoinGlassPlotter.update_long_short_ratios,
+            df,
+            max_points,
+        )
+
+    # The update_* methods swap the data of a figure built by the matching plot_*
+    # method, keeping its layout
+
+    @staticmethod
+    def _downsample(fig, df, time, downsample, max_points):
+        # The downsampling state is kept on the figure, so a live tick only adds
+        # its new bars to the points picked on an earlier tick
+        df, fig._downsampled = downsample_appending(
+            df, time, downsample, max_points, getattr(fig, "_downsampled", None)
+        )
+        return df
+
+    @staticmethod
+    def update_closing_prices(fig, df, max_points=MAX_POINTS):
+        df = CoinGlassPlotter._downsample(
+            fig,
+            df,
+            "t",
+            lambda frame, points: downsample_line(frame, "t", "c", points),
+            max_points,
+        )
+        fig.data[0].update(x=df["t"], y=df["c"])
+        return fig
+
+    @staticmethod
+    def update_candlestick_chart(fig, df, max_points=MAX_POINTS):
+        df = CoinGlassPlotter._downsample(fig, df, "t", downsample_ohlc, max_points)
+        fig.data[0].update(
+            x=df["t"], open=df["o"], high=df["h"], low=df["l"], close=df["c"]
+        )
+        return fig
+
+    @staticmethod
+    def update_long_short_ratios(fig, df, max_points=MAX_POINTS):
+        # shortRatio mirrors longRatio, so the rows picked for one suit both
+        df = CoinGlassPlotter._downsample(
+            fig,
+            df,
+            "createTime",
+            lambda frame, points: downsample_line(
+                frame, "createTime", "longRatio", points
             ),
+            max_points,
         )
+        for trace, column in zip(fig.data, ["longRatio", "shortRatio"]):
+            trace.update(x=df["createTime"], y=df[column])
         return fig
 
     @staticmethod
-    def plot_long_short_ratios(df, title="Top Traders Accounts Ratio"):
-        fig = px.line(
+    def plot_stacked_open_interest(df, title="Open Interest by Exchange"):
+        import plotly.express as px
+
+        fig = px.area(
             df,
-            x="createTime",
-            y=["longRatio", "shortRatio"],
+            x="t",
+            y="oi",
+            color="exchange",
             title=title,
-            labels={
-                "createTime": "Date",
-                "variable": "Ratio Type",
-                "value": "Ratio (%)",
-            },
-            color_discrete_sequence=["green", "red"],
+            labels={"t": "Date", "oi": "Open Interest", "share": "Share"},
+            hover_data={"share": ":.1%"},
+        )
+        return fig
+
+    @staticmethod
+    def plot_volume_weighted_price(
+        df, title="Volume-Weighted Price", max_points=MAX_POINTS, render_mode="svg"
+    ):
+        import plotly.express as px
+
+        def build(df):
+            return px.line(
+                df,
+                x="t",
+                y="vwap",
+                title=title,
+                labels={"vwap": "Price", "t": "Date"},
+                render_mode=render_mode,
+            )
+
+        return CoinGlassPlotter._from_skeleton(
+            ("volume_weighted_price", title, render_mode),
+            build,
+            CoinGlassPlotter.update_volume_weighted_price,
+            df,
+            max_points,
+        )
+
+    @staticmethod
+    def update_volume_weighted_price(fig, df, max_points=MAX_POINTS):
+        df = CoinGlassPlotter._downsample(
+            fig,
+            df,
+            "t",
+            lambda frame, points: downsample_line(frame, "t", "vwap", points),
+            max_points,
         )
-        fig.update_layout(yaxis=dict(range=[0, 100], dtick=10, title="Percentage"))
+        fig.data[0].update(x=df["t"], y=df["vwap"])
         return fig
 
 
 ################################################################################################################
 
 
+# The Streamlit layer imports streamlit inside its functions, so defining it at
+# import time costs nothing for users of the client alone
+def lazy_cache(kind, **options):
+    # Like @st.cache_data / @st.cache_resource, applied on the first call
+    def decorate(fn):
+        cached = None
+
+        def get():
+            nonlocal cached
+            if cached is None:
+                import streamlit as st
+
+                cached = getattr(st, kind)(**options)(fn)
+            return cached
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return get()(*args, **kwargs)
+
+        wrapper.clear = lambda *args, **kwargs: get().clear(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+
+# Longest a rendered dashboard may be reused across sessions; the client's
+# response cache applies the per-interval TTLs underneath
+DASHBOARD_TTL = 60
+# Series that poller.py (default cadence 60s) wrote more recently than this are
+# rendered straight from the candle store
+STORE_MAX_AGE = 120
+# Bars requested per metric on each live tick: the forming bar plus the one it
+# may just have closed
+LIVE_BARS = 2
+
+
+@lazy_cache("cache_data")
+def load_config(path="config.json"):
+    with open(path) as config_file:
+        return json.load(config_file)
+
+
+@lazy_cache("cache_resource")
+def get_coinglass_api(api_key):
+    # One client per server process, so every session shares its connection
+    # pool, response cache, rate limiter and candle store
+    return CoinGlassAPI(
+        api_key,
+        cache=ResponseCache(),
+        store=open_store(),
+        store_max_age=STORE_MAX_AGE,
+    )
+
+
+@lazy_cache("cache_resource")
+def get_instrument_catalog(api_key):
+    return InstrumentCatalog(get_coinglass_api(api_key)).start()
+
+
+@lazy_cache("cache_resource")
+def get_indicator_engine():
+    return IndicatorEngine()
+
+
+@lazy_cache("cache_resource")
+def get_screener(api_key, interval):
+    # Imported here because screener imports this module
+    from screener import Screener
+
+    return Screener(
+        get_coinglass_api(api_key), get_instrument_catalog(api_key), interval=interval
+    )
+
+
+# A resource rather than data cache: sessions share the bundle itself instead
+# of unpickling private copies, so series read from a ColumnStore stay
+# memory-mapped. Callers must not modify it; live mode works on a copy.
+@lazy_cache("cache_resource", ttl=DASHBOARD_TTL, show_spinner=False)
+def fetch_dashboard_data(api_key, exchange, pair, interval, limit):
+    bundle = get_coinglass_api(api_key).fetch_dashboard_bundle(
+        exchange, pair, interval=interval, limit=limit, incremental=True
+    )
+    # Streamlit re-executes this script on every rerun, redefining its classes;
+    # cache the bundle's fields rather than an instance of an old class
+    return vars(bundle)
+
+
+@lazy_cache("cache_data", ttl=DASHBOARD_TTL, show_spinner=False)
+def fetch_aggregate_data(api_key, coin, interval, limit):
+    pairs = get_instrument_catalog(api_key).primary_pairs(coin)
+    view = get_coinglass_api(api_key).fetch_aggregate(
+        pairs, interval=interval, limit=limit
+    )
+    return vars(view)
+
+
+@lazy_cache("cache_data", ttl=DASHBOARD_TTL, show_spinner=False)
+def fetch_live_bars(api_key, exchange, pair, interval, cadence, window):
+    # window is time.time() // cadence, so every session ticking on the same
+    # pair and cadence shares one upstream fetch per refresh window
+    bundle = get_coinglass_api(api_key).fetch_dashboard_bundle(
+        exchange, pair, interval=interval, limit=LIVE_BARS, refresh=True
+    )
+    return vars(bundle)
+
+
+def render_aggregate(coin, view):
+    import streamlit as st
+
+    for (metric, exchange, pair), err in view.errors.items():
+        st.error(f"Failed to fetch {metric} for {exchange} {pair}: {err}")
+    if view.totals.empty:
+        st.warning(f"No open interest data for {coin}")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric(
+        "Total Open Interest", f"{view.totals['total_oi'].to_numpy()[-1]:,.0f} {coin}"
+    )
+    col2.metric("Volume-Weighted Price", f"${view.totals['vwap'].to_numpy()[-1]:,.2f}")
+    col3.metric("Exchanges", len(view.by_exchange["exchange"].cat.categories))
+
+    left, right = st.columns(2)
+    with left:
+        st.plotly_chart(CoinGlassPlotter.plot_stacked_open_interest(view.by_exchange))
+    with right:
+        st.plotly_chart(CoinGlassPlotter.plot_volume_weighted_price(view.totals))
+
+
+def render_screener(api_key):
+    import streamlit as st
+
+    catalog = get_instrument_catalog(api_key)
+    exchanges = st.multiselect(
+        "Exchanges", catalog.exchanges(), help="Every exchange when left empty"
+    )
+    quote = st.selectbox("Quote asset", ["USDT", "USD", "USDC", "BUSD"])
+    interval = st.selectbox("Interval", ["h1", "h4", "h12", "h24"], index=3)
+    screener = get_screener(api_key, interval)
+    pairs = screener.universe(exchanges, [quote])
+    # Sweeps run on the screener's own thread; every session shows its latest
+    # results and none waits on the fetches
+    if st.button("Run screener", disabled=screener.running):
+        screener.start(pairs)
+
+    @st.fragment(run_every=5 if screener.running else None)
+    def results():
+        if screener.running:
+            progress = screener.progress
+            if progress is not None:
+                step, steps, count = progress
+                st.info(f"Sweeping {count} pairs: metric {step + 1} of {steps}")
+        if screener.swept_at is None:
+            return
+        if screener.errors:
+            st.warning(f"{len(screener.errors)} fetches failed")
+        table = screener.table(pairs)
+        # Click a column header to re-sort
+        st.dataframe(table, hide_index=True)
+        swept = time.strftime("%H:%M:%S", time.localtime(screener.swept_at))
+        st.caption(
+            f"{screener.rescored} of {len(table)} pairs re-scored "
+            f"in the sweep finished at {swept}"
+        )
+
+    results()
+
+
+def render_dashboard(coin, bundle, figures, coinglass_api, render_mode="svg"):
+    # figures maps chart name -> figure; figures already present are patched in
+    # place, so live mode keeps the same figures across ticks
+    import streamlit as st
+
+    build_times = {}
+
+    def chart(name, df, plot, update, *args, **options):
+        start = time.perf_counter()
+        if name in figures:
+            update(figures[name], df)
+        else:
+            figures[name] = plot(df, *args, **options)
+        build_times[name] = time.perf_counter() - start
+        return figures[name]
+
+    for name, err in bundle.errors.items():
+        st.error(f"Failed to fetch {name}: {err}")
+
+    series = bundle.series
+    # Each chart shows at most MAX_POINTS points; narrowing the visible window
+    # until it holds fewer bars shows them at full resolution
+    start = end = None
+    if len(series) > CoinGlassPlotter.MAX_POINTS:
+        first, last = (
+            pd.Timestamp(value).to_pydatetime() for value in series.index[[0, -1]]
+        )
+        start, end = st.slider(
+            "Visible window",
+            min_value=first,
+            max_value=last,
+            value=(first, last),
+            step=pd.Timedelta(np.diff(series.index).min()).to_pytimedelta(),
+            format="YYYY-MM-DD HH:mm",
+        )
+    col1, col2, col3, col4, col5 = st.columns(5)
+    fig_oi = fig_price = fig_ratio = fig_top_traders_ratio = None
+    if "open_interest_ohlc" in series:
+        with col1:
+            latest_oi = series.latest("open_interest_ohlc", "c")
+            st.metric("Open Interest", f"{latest_oi:,} {coin}")
+            fig_oi = chart(
+                "oi",
+                series.frame("open_interest_ohlc", start, end),
+                CoinGlassPlotter.plot_closing_prices,
+                CoinGlassPlotter.update_closing_prices,
+                "Open Interest",
+                render_mode=render_mode,
+            )
+    if "price_ohlc" in series:
+        with col2:
+            latest_close = series.latest("price_ohlc", "c")
+            st.metric("Price", f"${latest_close}")
+            fig_price = chart(
+                "price",
+                series.frame("price_ohlc", start, end),
+                CoinGlassPlotter.plot_candlestick_chart,
+                CoinGlassPlotter.update_candlestick_chart,
+                "Price",
+            )
+    if "top_long_short_account_ratio" in series:
+        with col3:
+            latest_long_ratio = series.latest(
+                "top_long_short_account_ratio", "longRatio"
+            )
+            latest_short_ratio = series.latest(
+                "top_long_short_account_ratio", "shortRatio"
+            )
+            st.metric(
+                "Top Accounts Ratio",
+                f"{latest_long_ratio:.2f}/{latest_short_ratio:.2f}",
+            )
+            fig_ratio = chart(
+                "ratio",
+                series.frame("top_long_short_account_ratio", start, end),
+                CoinGlassPlotter.plot_long_short_ratios,
+                CoinGlassPlotter.update_long_short_ratios,
+                render_mode=render_mode,
+            )
+    if "top_long_short_position_ratio" in series:
+        with col4:
+            latest_long_position_ratio = series.latest(
+                "top_long_short_position_ratio", "longRatio"
+            )
+            latest_short_position_ratio = series.latest(
+                "top_long_short_position_ratio", "shortRatio"
+            )
+            st.metric(
+                "Top Traders Position  Ratios",
+                f"{latest_long_position_ratio:.2f}/{latest_short_position_ratio:.2f}",
+            )
+            fig_top_traders_ratio = chart(
+                "top_traders_ratio",
+                series.frame("top_long_short_position_ratio", start, end),
+                CoinGlassPlotter.plot_long_short_ratios,
+                CoinGlassPlotter.update_long_short_ratios,
+                render_mode=render_mode,
+            )
+    # Create columns for the top row side-by-side display
+    top_col1, top_col2 = st.columns(2)
+    # Display top row plots
+    with top_col1:
+        if fig_price is not None:
+            st.plotly_chart(fig_price, key="chart_price")
+    with top_col2:
+        if fig_oi is not None:
+            st.plotly_chart(fig_oi, key="chart_oi")
+    # Create columns for the bottom row side-by-side display
+    bottom_col1, bottom_col2 = st.columns(2)
+    # Display bottom row plots
+    with bottom_col1:
+        if fig_ratio is not None:
+            st.plotly_chart(fig_ratio, key="chart_ratio")
+    with bottom_col2:
+        if fig_top_traders_ratio is not None:
+            st.plotly_chart(fig_top_traders_ratio, key="chart_top_traders_ratio")
+    # Create columns for the bottombottom row side by side
+    bot2, bot3 = st.columns(2)
+    if "long_short_accounts" in series:
+        with bot2:
+            L_plot = chart(
+                "accounts",
+                series.frame("long_short_accounts", start, end),
+                CoinGlassPlotter.plot_long_short_ratios,
+                CoinGlassPlotter.update_long_short_ratios,
+                "Total Accounts",
+                render_mode=render_mode,
+            )
+            st.plotly_chart(L_plot, key="chart_accounts")
+
+        with col5:
+            latest_long_ratio = series.latest("long_short_accounts", "longRatio")
+            latest_short_ratio = series.latest("long_short_accounts", "shortRatio")
+            st.metric(
+                "All Accounts Ratio",
+                f"{latest_long_ratio:.2f}/{latest_short_ratio:.2f}",
+            )
+
+    with bot3:
+        with st.expander("Indicators"):
+            # Extended incrementally from the previous render of this pair
+            indicators = get_indicator_engine().compute(series)
+            st.dataframe(indicators.iloc[::-1].head(10), hide_index=True)
+        st.caption(
+            " · ".join(
+                f"{name}: {seconds * 1000:.0f} ms"
+                for name, seconds in bundle.timings.items()
+            )
+        )
+        st.caption(
+            "Figures: "
+            + " · ".join(
+                f"{name}: {seconds * 1000:.1f} ms"
+                for name, seconds in build_times.items()
+            )
+        )
+        connections = coinglass_api.connection_stats()
+        st.caption(
+            f"Connections: {connections['new_connections']} new, "
+            f"{connections['reused_connections']} reused"
+        )
+        coalescing = coinglass_api.coalescing_stats()
+        st.caption(
+            f"Requests: {coalescing['executed']} sent, "
+            f"{coalescing['coalesced']} coalesced"
+        )
+        throttle = coinglass_api.rate_limit_stats()
+        if throttle:
+            st.caption(
+                f"Rate limit: {throttle['throttled']} throttled, "
+                f"{throttle['throttle_wait_seconds']:.1f}s waited, "
+                f"{throttle['retries']} retries"
+            )
+        cache_stats = coinglass_api.cache.stats()
+        st.caption(
+            f"Cache: {cache_stats['hits']} hits, "
+            f"{cache_stats['misses']} misses, "
+            f"{cache_stats['evictions']} evictions"
+        )
+
+
+def render_live_dashboard(
+    api_key, coin, exchange, pair, interval, limit, cadence, render_mode="svg"
+):
+    # Runs as a fragment on a timer: the first tick loads the full series, later
+    # ticks fetch only the newest bars and ingest them into the session's series
+    import streamlit as st
+
+    coinglass_api = get_coinglass_api(api_key)
+    live = st.session_state.get("live")
+    # A new render mode needs new figures, so it starts over like a new pair
+    if live is None or live["key"] != (exchange, pair, interval, render_mode):
+        bundle = DashboardBundle(
+            **fetch_dashboard_data(api_key, exchange, pair, interval, limit)
+        )
+        # Ticks ingest into the series, so take this session's own copy
+        bundle.series = bundle.series.copy()
+        live = st.session_state["live"] = {
+            "key": (exchange, pair, interval, render_mode),
+            "bundle": bundle,
+            "figures": {},
+        }
+    else:
+        bundle = live["bundle"]
+        live_key = (
+            api_key,
+            exchange,
+            pair,
+            interval,
+            cadence,
+            int(time.time() // cadence),
+        )
+        newest = DashboardBundle(**fetch_live_bars(*live_key))
+        if newest.errors:
+            # Let the next tick retry rather than share the failure
+            fetch_live_bars.clear(*live_key)
+        for name, metric in DashboardBundle.FIELD_METRICS.items():
+            if getattr(newest, name) is not None:
+                bundle.series.ingest(metric, getattr(newest, name))
+                setattr(bundle, name, bundle.series.frame(metric))
+        bundle.timings = newest.timings
+        bundle.errors = newest.errors
+
+    render_dashboard(coin, bundle, live["figures"], coinglass_api, render_mode)
+
+
 def main():
+    import streamlit as st
+
     st.set_page_config(layout="wide", page_icon="🧊")
     st.title("Coin Advanced Metrics")
 
     # Load the configuration file
-    with open("config.json") as config_file:
-        config = json.load(config_file)
+    config = load_config()
+    api_key = config["coinglassSecret"]
 
-    # Create an instance of the CoinGlassAPI with the API key
-    coinglass_api = CoinGlassAPI(api_key=config["coinglassSecret"])
+    # Shared instance of the CoinGlassAPI for the API key
+    coinglass_api = get_coinglass_api(api_key)
+
+    if st.radio("View", ["Dashboard", "Screener"], horizontal=True) == "Screener":
+        render_screener(api_key)
+        return
 
     # User input for coin
     coin = st.text_input("Enter the coin symbol (e.g., BTC):").upper()
     if coin:
-        # Fetch available pairs
-        available_pairs_df = coinglass_api.get_available_pairs(coin)
+        # Look up available pairs in the in-memory instrument catalog
+        catalog = get_instrument_catalog(api_key)
+        available_pairs_df = catalog.pairs_for(coin)
         if not available_pairs_df.empty:
+            if st.toggle("All exchanges"):
+                interval = st.selectbox("Interval", ["h1", "h4", "h12", "h24"], index=3)
+                if st.button("Fetch Data"):
+                    cache_key = (api_key, coin, interval, 50)
+                    view = AggregatedView(**fetch_aggregate_data(*cache_key))
+                    if view.errors:
+                        # As for a single pair, retry the failed exchanges on
+                        # the next click
+                        fetch_aggregate_data.clear(*cache_key)
+                    render_aggregate(coin, view)
+                return
+
             # User input for exchange and pair
             selected_exchange = st.selectbox(
                 "Select Exchange", available_pairs_df["exchange"].unique()
             )
             selected_pair = st.selectbox(
                 "Select Pair",
-                available_pairs_df.query("exchange == @selected_exchange")[
-                    "instrumentId"
-                ],
+                catalog.pairs_for(coin, selected_exchange)["instrumentId"],
+            )
+
+            interval = st.selectbox("Interval", ["h1", "h4", "h12", "h24"], index=3)
+            limit = 50
+            render_mode = st.radio(
+                "Line charts", CoinGlassPlotter.RENDER_MODES, horizontal=True
             )
+            live_mode = st.toggle("Live mode")
+
+            if live_mode:
+                cadence = st.number_input(
+                    "Refresh every (seconds)", min_value=5, value=30, step=5
+                )
+                st.fragment(run_every=cadence)(render_live_dashboard)(
+                    api_key,
+                    coin,
+                    selected_exchange,
+                    selected_pair,
+                    interval,
+                    limit,
+                    cadence,
+                    render_mode,
+                )
+                return
+
+            force_refresh = st.checkbox("Force refresh (bypass cache)")
 
             # Fetch and display data on button click
             if st.button("Fetch Data"):
-                col1, col2, col3, col4, col5 = st.columns(5)
-                # Fetch and display data on button click
-                with col1:
-                    ohlc_oi_data = coinglass_api.fetch_ohlc_oi_data(
-                        selected_exchange, selected_pair
-                    )
-                    latest_oi = ohlc_oi_data.iloc[-1]["c"]
-                    st.metric("Open Interest", f"{latest_oi:,} {coin}")
-                    fig_oi = CoinGlassPlotter.plot_closing_prices(
-                        ohlc_oi_data, "Open Interest"
-                    )
-                with col2:
-                    price_ohlc_data = coinglass_api.fetch_price_ohlc_data(
-                        selected_exchange, selected_pair
-                    )
-                    latest_close = price_ohlc_data.iloc[0]["c"]
-                    st.metric("Price", f"${latest_close}")
-                    fig_price = CoinGlassPlotter.plot_candlestick_chart(
-                        price_ohlc_data, "Price"
-                    )
-                with col3:
-                    long_short_data = coinglass_api.fetch_top_long_short_ratio(
-                        selected_exchange, selected_pair
-                    )
-                    latest_long_ratio = long_short_data.iloc[0]["longRatio"]
-                    latest_short_ratio = long_short_data.iloc[0]["shortRatio"]
-                    st.metric(
-                        "Top Accounts Ratio",
-                        f"{latest_long_ratio}/{latest_short_ratio}",
-                    )
-                    fig_ratio = CoinGlassPlotter.plot_long_short_ratios(long_short_data)
-                with col4:
-                    top_traders_data = (
-                        coinglass_api.fetch_top_long_short_position_ratio(
-                            selected_exchange, selected_pair
-                        )
-                    )
-                    latest_long_position_ratio = top_traders_data.iloc[0]["longRatio"]
-                    latest_short_position_ratio = top_traders_data.iloc[0]["shortRatio"]
-                    st.metric(
-                        "Top Traders Position  Ratios",
-                        f"{latest_long_position_ratio}/{latest_short_position_ratio}",
-                    )
-                    fig_top_traders_ratio = CoinGlassPlotter.plot_long_short_ratios(
-                        top_traders_data
-                    )
-                # Create columns for the top row side-by-side display
-                top_col1, top_col2 = st.columns(2)
-                # Display top row plots
-                with top_col1:
-                    st.plotly_chart(fig_price)
-                with top_col2:
-                    st.plotly_chart(fig_oi)
-                # Create columns for the bottom row side-by-side display
-                bottom_col1, bottom_col2 = st.columns(2)
-                # Display bottom row plots
-                with bottom_col1:
-                    st.plotly_chart(fig_ratio)
-                with bottom_col2:
-                    st.plotly_chart(fig_top_traders_ratio)
-                # Create columns for the bottombottom row side by side
-                bot2, bot3 = st.columns(2)
-                with bot2:
-                    L_data = coinglass_api.fetch_top_long_short_loser(
-                        selected_exchange, selected_pair
-                    )
-                    L_plot = CoinGlassPlotter.plot_long_short_ratios(
-                        L_data, "Total Accounts"
-                    )
-                    st.plotly_chart(L_plot)
-
-                with col5:
-                    latest_long_ratio = L_data.iloc[-1]["longRatio"]
-                    latest_short_ratio = L_data.iloc[-1]["shortRatio"]
-                    st.metric(
-                        "All Accounts Ratio",
-                        f"{latest_long_ratio}/{latest_short_ratio}",
+                cache_key = (api_key, selected_exchange, selected_pair, interval, limit)
+                if force_refresh:
+                    fetch_dashboard_data.clear(*cache_key)
+                    bundle = coinglass_api.fetch_dashboard_bundle(
+                        selected_exchange,
+                        selected_pair,
+                        interval=interval,
+                        limit=limit,
+                        refresh=True,
+                        incremental=True,
                     )
+                else:
+                    # Fetches every metric concurrently, or reuses the bundle
+                    # another session fetched within DASHBOARD_TTL
+                    bundle = DashboardBundle(**fetch_dashboard_data(*cache_key))
+                    if bundle.errors:
+                        # Retry failed endpoints on the next click instead of
+                        # serving the partial bundle for the whole TTL
+                        fetch_dashboard_data.clear(*cache_key)
+                render_dashboard(coin, bundle, {}, coinglass_api, render_mode)
 
 
 if __name__ == "__main__":
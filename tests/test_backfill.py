@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backfill import Backfill, Checkpoints  # noqa: E402
+from column_store import ColumnStore  # noqa: E402
+
+HOUR = 3_600_000
+BARS = 1000
+SERIES = ("Binance", "BTCUSDT", "h1", "open_interest_ohlc")
+
+
+class PagedAPI:
+    # Serves BARS hourly bars ending at BARS * HOUR, newest page first
+    def __init__(self):
+        self.requests = 0
+
+    def fetch_page(self, metric, exchange, pair, interval, limit, end_time=None):
+        self.requests += 1
+        times = np.arange(BARS) * HOUR
+        if end_time is not None:
+            times = times[times <= end_time]
+        times = times[-limit:]
+        values = np.ones(len(times))
+        return {"t": times, "o": values, "h": values, "l": values, "c": values}
+
+
+class BackfillSinceTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.api = PagedAPI()
+        self.store = ColumnStore(os.path.join(directory.name, "store"))
+        self.checkpoints_path = os.path.join(directory.name, "backfill.json")
+
+    def backfill(self, since=None):
+        backfill = Backfill(
+            self.api,
+            store=self.store,
+            checkpoints=Checkpoints(self.checkpoints_path),
+            page_limit=100,
+        )
+        return backfill.backfill_series(*SERIES, since=since)
+
+    def test_older_since_resumes(self):
+        self.backfill(since=800 * HOUR)
+        self.assertEqual(self.store.row_count(*SERIES), 200)
+        self.backfill(since=500 * HOUR)
+        self.assertEqual(self.store.row_count(*SERIES), 500)
+
+    def test_covered_since_makes_no_requests(self):
+        self.backfill(since=500 * HOUR)
+        requests = self.api.requests
+        self.assertEqual(self.backfill(since=700 * HOUR), 0)
+        self.assertEqual(self.api.requests, requests)
+
+    def test_exhausted_history_stops(self):
+        self.backfill()
+        self.assertEqual(self.store.row_count(*SERIES), BARS)
+        requests = self.api.requests
+        self.assertEqual(self.backfill(), 0)
+        self.assertEqual(self.backfill(since=0), 0)
+        self.assertEqual(self.api.requests, requests)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import multiprocessing
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from column_store import ColumnStore  # noqa: E402
+
+BARS = 200
+SERIES = ("Binance", "BTCUSDT", "h1", "open_interest_ohlc")
+
+
+def write_bars(path, offset):
+    # One bar per upsert, interleaved with the other writer's timestamps
+    store = ColumnStore(path)
+    for bar in range(BARS):
+        t = (2 * bar + offset) * 3_600_000
+        store.upsert(
+            *SERIES,
+            pd.DataFrame({"t": [t], "o": [1.0], "h": [1.0], "l": [1.0], "c": [1.0]}),
+        )
+
+
+class ConcurrentWritersTest(unittest.TestCase):
+    def test_two_processes_writing_one_series(self):
+        with tempfile.TemporaryDirectory() as path:
+            context = multiprocessing.get_context("spawn")
+            workers = [
+                context.Process(target=write_bars, args=(path, offset))
+                for offset in (0, 1)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            self.assertEqual([worker.exitcode for worker in workers], [0, 0])
+
+            store = ColumnStore(path)
+            frame = store.read(*SERIES)
+            self.assertEqual(len(frame), 2 * BARS)
+            self.assertTrue(frame["t"].is_monotonic_increasing)
+            self.assertEqual(
+                store.latest_timestamp(*SERIES), (2 * BARS - 1) * 3_600_000
+            )
+            # The series stays writable
+            store.upsert(*SERIES, frame.tail(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from candle_store import VALUE_DTYPES  # noqa: E402
+from stream6 import decode_rows  # noqa: E402
+
+
+class DecodeRowsTest(unittest.TestCase):
+    def test_positional_rows(self):
+        # price_ohlc rows are [t, o, h, l, c, v] with string prices
+        rows = [
+            [1700000000, "1", "2", "0.5", "1.5", "10"],
+            [1700003600, 2, 3, 1, 2, 20],
+        ]
+        columns = decode_rows(rows, "price_ohlc")
+        self.assertEqual(list(columns), ["t", "o", "h", "l", "c", "v"])
+        np.testing.assert_array_equal(columns["t"], [1700000000, 1700003600])
+        self.assertEqual(columns["t"].dtype, np.int64)
+        np.testing.assert_array_equal(columns["c"], [1.5, 2.0])
+        self.assertEqual(columns["c"].dtype, VALUE_DTYPES["price_ohlc"])
+
+    def test_dict_rows_fill_missing_columns(self):
+        rows = [
+            {"createTime": 1700000000000, "longRatio": 60.5, "shortRatio": 39.5},
+            {"createTime": 1700003600000, "longRatio": 55.0, "shortRatio": 45.0},
+        ]
+        columns = decode_rows(rows, "top_long_short_account_ratio")
+        np.testing.assert_array_equal(
+            columns["createTime"], [r["createTime"] for r in rows]
+        )
+        np.testing.assert_array_equal(columns["longRatio"], [60.5, 55.0])
+        self.assertTrue(np.isnan(columns["longShortRatio"]).all())
+        self.assertEqual(
+            columns["longRatio"].dtype, VALUE_DTYPES["top_long_short_account_ratio"]
+        )
+
+    def test_empty_rows(self):
+        columns = decode_rows([], "open_interest_ohlc")
+        self.assertEqual(list(columns), ["t", "o", "h", "l", "c"])
+        self.assertTrue(all(len(values) == 0 for values in columns.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
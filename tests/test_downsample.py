@@ -0,0 +1,98 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from downsample import (  # noqa: E402
+    downsample_appending,
+    downsample_line,
+    downsample_ohlc,
+)
+
+BARS = 5000
+
+
+def rising_bars():
+    # Oldest first; every bar closes above its open
+    close = np.arange(BARS, dtype=np.float64) + 1
+    return pd.DataFrame(
+        {
+            "t": pd.date_range("2020-01-01", periods=BARS, freq="h").to_numpy(),
+            "o": close - 0.5,
+            "h": close + 0.25,
+            "l": close - 0.75,
+            "c": close,
+        }
+    )
+
+
+class DownsampleOhlcTest(unittest.TestCase):
+    def test_newest_first_frame_matches_oldest_first(self):
+        bars = rising_bars()
+        expected = downsample_ohlc(bars, 1000)
+        merged = downsample_ohlc(bars.iloc[::-1].reset_index(drop=True), 1000)
+        pd.testing.assert_frame_equal(merged, expected)
+        self.assertTrue((merged["c"] > merged["o"]).all())
+        self.assertTrue(merged["t"].is_monotonic_increasing)
+        self.assertEqual(merged["o"].iloc[0], bars["o"].iloc[0])
+        self.assertEqual(merged["c"].iloc[-1], bars["c"].iloc[-1])
+        self.assertEqual(merged["h"].max(), bars["h"].max())
+        self.assertEqual(merged["l"].min(), bars["l"].min())
+
+    def test_short_frame_is_unchanged(self):
+        bars = rising_bars().head(50)
+        self.assertIs(downsample_ohlc(bars, 1000), bars)
+
+
+class DownsampleLineTest(unittest.TestCase):
+    def test_newest_first_frame_matches_oldest_first(self):
+        bars = rising_bars()
+        expected = downsample_line(bars, "t", "c", 1000)
+        picked = downsample_line(bars.iloc[::-1], "t", "c", 1000)
+        self.assertEqual(len(picked), 1000)
+        np.testing.assert_array_equal(picked["t"], expected["t"])
+        self.assertEqual(picked["t"].iloc[0], bars["t"].iloc[0])
+        self.assertEqual(picked["t"].iloc[-1], bars["t"].iloc[-1])
+
+
+class DownsampleAppendingTest(unittest.TestCase):
+    def downsample(self, df, previous=None):
+        return downsample_appending(df, "t", downsample_ohlc, 1000, previous, tail=100)
+
+    def test_ticks_reuse_the_head(self):
+        bars = rising_bars()
+        points, state = self.downsample(bars.iloc[:-10])
+        self.assertLessEqual(len(points), 1000)
+        for end in range(BARS - 9, BARS + 1):
+            # Each tick revises the forming bar and may add a new one
+            tick = bars.iloc[:end].copy()
+            tick.loc[tick.index[-1], "c"] = -1.0
+            points, next_state = self.downsample(tick, state)
+            self.assertIs(next_state, state)
+            self.assertLessEqual(len(points), 1000)
+            self.assertEqual(points["t"].iloc[-1], tick["t"].iloc[-1])
+            self.assertEqual(points["c"].iloc[-1], -1.0)
+            self.assertTrue(points["t"].is_monotonic_increasing)
+
+    def test_long_tail_downsamples_again(self):
+        bars = rising_bars()
+        _, state = self.downsample(bars.iloc[:-200])
+        points, next_state = self.downsample(bars, state)
+        self.assertIsNot(next_state, state)
+        self.assertLessEqual(len(points), 1000)
+        self.assertEqual(points["c"].iloc[-1], bars["c"].iloc[-1])
+
+    def test_moved_window_downsamples_again(self):
+        bars = rising_bars()
+        _, state = self.downsample(bars)
+        points, next_state = self.downsample(bars.iloc[500:], state)
+        self.assertIsNot(next_state, state)
+        self.assertEqual(points["t"].iloc[0], bars["t"].iloc[500])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators import (  # noqa: E402
+    INCREMENTAL_MAX_BARS,
+    INDICATOR_COLUMNS,
+    IndicatorEngine,
+)
+from timeseries import PairSeries  # noqa: E402
+
+BARS = 300
+
+
+def frames(bars=BARS, seed=0):
+    rng = np.random.default_rng(seed)
+    times = pd.date_range("2024-01-01", periods=bars, freq="h")
+    close = 30000 + np.cumsum(rng.normal(0, 50, bars))
+    oi = 1e9 + np.cumsum(rng.normal(0, 1e6, bars))
+    ratio = 1 + rng.normal(0, 0.1, bars)
+    # Gaps in a metric show up as NaN bars
+    ratio[rng.choice(bars, 10, replace=False)] = np.nan
+    prices = pd.DataFrame(
+        {
+            "t": times,
+            "o": close,
+            "h": close + 40,
+            "l": close - 40,
+            "c": close,
+            "v": close,
+        }
+    )
+    interest = pd.DataFrame({"t": times, "o": oi, "h": oi, "l": oi, "c": oi})
+    ratios = pd.DataFrame(
+        {
+            "createTime": times,
+            "longRatio": ratio,
+            "shortRatio": ratio,
+            "longShortRatio": ratio,
+        }
+    )
+    return {
+        "price_ohlc": prices,
+        "open_interest_ohlc": interest,
+        "top_long_short_account_ratio": ratios,
+    }
+
+
+def ingest(series, data, start, end):
+    for metric, frame in data.items():
+        series.ingest(metric, frame.iloc[start:end].reset_index(drop=True))
+    return series
+
+
+class IncrementalIndicatorsTest(unittest.TestCase):
+    def setUp(self):
+        self.data = frames()
+        self.engine = IndicatorEngine()
+        self.series = ingest(PairSeries("Binance", "BTCUSDT", "h1"), self.data, 0, 200)
+        self.engine.compute(self.series)
+
+    def assertMatchesFullComputation(self):
+        incremental = self.engine.compute(self.series)
+        full = IndicatorEngine().compute(self.series.copy())
+        np.testing.assert_array_equal(incremental["t"], full["t"])
+        for name in INDICATOR_COLUMNS:
+            np.testing.assert_allclose(
+                incremental[name], full[name], rtol=1e-9, equal_nan=True, err_msg=name
+            )
+
+    def test_appended_bars(self):
+        for end in [201, 202, 210, 240]:
+            ingest(self.series, self.data, end - 1, end)
+            self.assertMatchesFullComputation()
+        self.assertEqual(self.engine.full_computations, 1)
+        self.assertEqual(self.engine.incremental_updates, 4)
+
+    def test_appended_batch(self):
+        ingest(self.series, self.data, 200, 200 + INCREMENTAL_MAX_BARS - 1)
+        self.assertMatchesFullComputation()
+        self.assertEqual(self.engine.incremental_updates, 1)
+
+    def test_revised_last_bar(self):
+        revised = frames(seed=1)
+        for metric, frame in revised.items():
+            frame.iloc[:, 0] = self.data[metric].iloc[:, 0]
+        ingest(self.series, revised, 199, 200)
+        self.assertMatchesFullComputation()
+        ingest(self.series, self.data, 200, 201)
+        ingest(self.series, revised, 200, 201)
+        self.assertMatchesFullComputation()
+        self.assertEqual(self.engine.full_computations, 1)
+        self.assertEqual(self.engine.incremental_updates, 2)
+
+    def test_large_gap_recomputes(self):
+        ingest(self.series, self.data, 200, BARS)
+        self.assertMatchesFullComputation()
+        self.assertEqual(self.engine.full_computations, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
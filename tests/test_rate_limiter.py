@@ -0,0 +1,45 @@
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stream6 import RateLimiter  # noqa: E402
+
+
+class RateLimiterPauseTest(unittest.TestCase):
+    def test_concurrent_pauses_take_the_longest(self):
+        limiter = RateLimiter(requests_per_minute=30)
+        single = RateLimiter(requests_per_minute=30)
+        single.pause(60)
+        # fetch_dashboard_bundle sends five requests at once, so one throttled
+        # burst pauses five times
+        threads = [threading.Thread(target=limiter.pause, args=(60,)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # 60s plus the 2s a token takes to refill at 30 requests per minute
+        self.assertAlmostEqual(single.reserve(), 62, delta=0.5)
+        self.assertAlmostEqual(limiter.reserve(), 62, delta=0.5)
+
+    def test_shorter_pause_keeps_the_longer_one(self):
+        limiter = RateLimiter(requests_per_minute=30)
+        limiter.pause(60)
+        limiter.pause(5)
+        self.assertAlmostEqual(limiter.reserve(), 62, delta=0.5)
+
+    def test_pause_holds_back_a_full_bucket(self):
+        limiter = RateLimiter(requests_per_minute=30)
+        limiter.pause(10)
+        self.assertAlmostEqual(limiter.reserve(), 12, delta=0.5)
+
+    def test_reserve_waits_once_the_burst_is_spent(self):
+        limiter = RateLimiter(requests_per_minute=30, burst=2)
+        self.assertEqual([limiter.reserve() for _ in range(2)], [0.0, 0.0])
+        self.assertAlmostEqual(limiter.reserve(), 2, delta=0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
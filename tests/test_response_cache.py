@@ -0,0 +1,51 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stream6 import ResponseCache  # noqa: E402
+
+ENDPOINT = "/public/v2/indicator/price_ohlc"
+
+
+def params(pair, interval="h1"):
+    return {"ex": "Binance", "pair": pair, "interval": interval}
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def test_entries_expire_after_their_ttl(self):
+        cache = ResponseCache()
+        with mock.patch("stream6.time.monotonic", return_value=1000.0) as clock:
+            cache.set(ENDPOINT, params("BTCUSDT"), "h1")
+            cache.set(ENDPOINT, params("BTCUSDT", "h24"), "h24")
+            # h1 bars live five minutes, h24 bars two hours
+            clock.return_value = 1000.0 + 299
+            self.assertEqual(cache.get(ENDPOINT, params("BTCUSDT")), "h1")
+            clock.return_value = 1000.0 + 300
+            self.assertIsNone(cache.get(ENDPOINT, params("BTCUSDT")))
+            self.assertEqual(cache.get(ENDPOINT, params("BTCUSDT", "h24")), "h24")
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResponseCache(max_entries=2)
+        cache.set(ENDPOINT, params("BTCUSDT"), "btc")
+        cache.set(ENDPOINT, params("ETHUSDT"), "eth")
+        cache.get(ENDPOINT, params("BTCUSDT"))
+        cache.set(ENDPOINT, params("SOLUSDT"), "sol")
+        self.assertEqual(cache.get(ENDPOINT, params("BTCUSDT")), "btc")
+        self.assertIsNone(cache.get(ENDPOINT, params("ETHUSDT")))
+        self.assertEqual(cache.get(ENDPOINT, params("SOLUSDT")), "sol")
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_key_ignores_parameter_order(self):
+        cache = ResponseCache()
+        cache.set(ENDPOINT, {"ex": "Binance", "pair": "BTCUSDT"}, "btc")
+        self.assertEqual(
+            cache.get(ENDPOINT, {"pair": "BTCUSDT", "ex": "Binance"}), "btc"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stream6 import SingleFlight  # noqa: E402
+
+CALLERS = 8
+
+
+class SingleFlightTest(unittest.TestCase):
+    def run_concurrently(self, flight, fn):
+        # Holds the leader inside fn until every caller has joined the call
+        release = threading.Event()
+
+        def work():
+            release.wait()
+            return fn()
+
+        def call():
+            try:
+                return flight.do("key", work)
+            except Exception as err:
+                return err
+
+        with ThreadPoolExecutor(CALLERS) as pool:
+            futures = [pool.submit(call) for _ in range(CALLERS)]
+            while flight.stats()["coalesced"] < CALLERS - 1:
+                time.sleep(0.001)
+            release.set()
+            return [future.result() for future in futures]
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+        results = self.run_concurrently(flight, lambda: calls.append(1) or "payload")
+        self.assertEqual(results, ["payload"] * CALLERS)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(
+            flight.stats(), {"in_flight": 0, "executed": 1, "coalesced": CALLERS - 1}
+        )
+
+    def test_error_reaches_every_caller(self):
+        flight = SingleFlight()
+        error = ValueError("upstream failed")
+
+        def fail():
+            raise error
+
+        self.assertEqual(self.run_concurrently(flight, fail), [error] * CALLERS)
+        # A finished call is not reused
+        self.assertEqual(flight.do("key", lambda: "retry"), "retry")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import asyncio
+import os
+import sys
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from async_coinglass import AsyncCoinGlassAPI, aiohttp  # noqa: E402
+from mock_server import MockCoinGlassServer  # noqa: E402
+from stream6 import CoinGlassAPI  # noqa: E402
+
+ENDPOINT = "/public/v2/indicator/price_ohlc"
+PARAMS = {"ex": "Binance", "pair": "BTCUSDT", "interval": "h1", "limit": 10}
+
+
+class StuckUpstreamTest(unittest.TestCase):
+    def setUp(self):
+        self.server = MockCoinGlassServer(latency=3).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_coalesced_callers_time_out(self):
+        api = CoinGlassAPI(
+            "key", base_url=self.server.url, requests_per_minute=None, timeout=0.5
+        )
+        start = time.monotonic()
+        # Both calls join one in-flight request, and both see its timeout
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(api._request, ENDPOINT, PARAMS) for _ in range(2)
+            ]
+            for future in futures:
+                with self.assertRaises(requests.exceptions.Timeout):
+                    future.result()
+        self.assertLess(time.monotonic() - start, 2)
+        api.close()
+
+    @unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+    def test_async_client_times_out(self):
+        async def fetch():
+            async with AsyncCoinGlassAPI(
+                "key", base_url=self.server.url, requests_per_minute=None, timeout=0.5
+            ) as api:
+                await api._request(ENDPOINT, PARAMS)
+
+        start = time.monotonic()
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(fetch())
+        self.assertLess(time.monotonic() - start, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
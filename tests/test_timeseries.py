@@ -0,0 +1,67 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timeseries import PairSeries  # noqa: E402
+
+BARS = 10
+
+
+def price_frame(start=0, bars=BARS, close=None):
+    times = pd.date_range("2024-01-01", periods=BARS, freq="h")[start : start + bars]
+    close = np.arange(start, start + bars, dtype=np.float64) if close is None else close
+    return pd.DataFrame(
+        {"t": times, "o": close, "h": close, "l": close, "c": close, "v": close}
+    )
+
+
+def read_only(frame):
+    # Stands in for memory-mapped ColumnStore columns
+    for name in frame.columns:
+        frame[name].to_numpy().flags.writeable = False
+    return frame
+
+
+class PairSeriesIngestTest(unittest.TestCase):
+    def test_full_coverage_frame_is_not_copied(self):
+        frame = price_frame()
+        series = PairSeries().ingest("price_ohlc", frame)
+        self.assertTrue(np.shares_memory(series.columns["price_ohlc"]["c"], frame["c"]))
+        newest_first = frame.iloc[::-1].reset_index(drop=True)
+        series = PairSeries().ingest("price_ohlc", newest_first)
+        self.assertTrue(
+            np.shares_memory(series.columns["price_ohlc"]["c"], newest_first["c"])
+        )
+        np.testing.assert_array_equal(series.frame("price_ohlc")["c"], frame["c"])
+
+    def test_revising_a_borrowed_column_copies_it(self):
+        frame = read_only(price_frame())
+        series = PairSeries().ingest("price_ohlc", frame)
+        series.ingest("price_ohlc", price_frame(start=BARS - 1, bars=1, close=[-1.0]))
+        self.assertEqual(series.latest("price_ohlc", "c"), -1.0)
+        self.assertEqual(frame["c"].iloc[-1], BARS - 1)
+
+    def test_copy_is_independent(self):
+        series = PairSeries().ingest("price_ohlc", price_frame(bars=BARS - 1))
+        copy = series.copy()
+        copy.ingest(
+            "price_ohlc", price_frame(start=BARS - 2, bars=2, close=[-1.0, -2.0])
+        )
+        self.assertEqual((len(series), len(copy)), (BARS - 1, BARS))
+        self.assertEqual(series.latest("price_ohlc", "c"), BARS - 2)
+        self.assertEqual(copy.latest("price_ohlc", "c"), -2.0)
+
+    def test_overlapping_frames_merge(self):
+        series = PairSeries().ingest("price_ohlc", price_frame(bars=5))
+        series.ingest("price_ohlc", price_frame(start=3, bars=4))
+        self.assertEqual(len(series), 7)
+        np.testing.assert_array_equal(series.frame("price_ohlc")["c"], np.arange(7))
+
+
+if __name__ == "__main__":
+    unittest.main()
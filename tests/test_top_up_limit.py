@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stream6 import API_MAX_LIMIT, top_up_limit  # noqa: E402
+
+HOUR = 3600
+
+
+def bars_ago(bars):
+    # Open time in epoch ms of the h1 bar `bars` bars before the current one
+    return (time.time() // HOUR - bars) * HOUR * 1000
+
+
+class TopUpLimitTest(unittest.TestCase):
+    def test_empty_store_requests_limit(self):
+        self.assertEqual(top_up_limit(None, "open_interest_ohlc", "h1", 50), 50)
+
+    def test_up_to_date_store_requests_new_bars(self):
+        limit = top_up_limit(bars_ago(2), "open_interest_ohlc", "h1", 50, 200)
+        self.assertEqual(limit, 3)
+
+    def test_gap_longer_than_limit_is_fetched_whole(self):
+        limit = top_up_limit(bars_ago(120), "open_interest_ohlc", "h1", 50, 200)
+        self.assertEqual(limit, 121)
+
+    def test_shallow_store_is_deepened_to_limit(self):
+        limit = top_up_limit(bars_ago(0), "open_interest_ohlc", "h1", 500, 10)
+        self.assertEqual(limit, 500)
+
+    def test_seconds_metric_and_api_cap(self):
+        latest = bars_ago(10_000) / 1000
+        self.assertEqual(top_up_limit(latest, "price_ohlc", "h1", 50), API_MAX_LIMIT)
+
+
+if __name__ == "__main__":
+    unittest.main()
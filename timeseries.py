@@ -0,0 +1,155 @@
+import copy
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from candle_store import METRICS
+
+# Versions are unique across all series, so equal versions mean equal contents
+# (copies of one series unpickled from a cache share theirs)
+_versions = itertools.count(1)
+
+
+def to_datetime64(value):
+    return pd.Timestamp(value).to_datetime64().astype("datetime64[ms]")
+
+
+def ascending(times):
+    return bool(np.all(times[1:] > times[:-1]))
+
+
+class PairSeries:
+    # Every metric of one exchange/pair/interval aligned on one ascending
+    # datetime64[ms] index. Each metric column is a NumPy array as long as the
+    # index, NaN where that metric has no bar at that time.
+    #
+    # A frame with a bar at every index position is held without copying, so
+    # columns read from a ColumnStore stay memory-mapped. Such borrowed columns
+    # are copied before a later ingest writes into them.
+    def __init__(self, exchange=None, pair=None, interval=None):
+        self.exchange = exchange
+        self.pair = pair
+        self.interval = interval
+        self.index = np.empty(0, dtype="datetime64[ms]")
+        # metric -> column name -> values aligned to index
+        self.columns = {}
+        # metric -> bool mask of index positions holding a bar of that metric
+        self._present = {}
+        # metric -> index positions of its oldest and newest bar
+        self._first = {}
+        self._last = {}
+        # Renewed on every ingest, so derived results can be cached per version
+        self.version = next(_versions)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, metric):
+        return metric in self._last
+
+    def metrics(self):
+        return list(self._last)
+
+    def _reindex(self, index):
+        positions = np.searchsorted(index, self.index)
+        for metric, columns in self.columns.items():
+            for name, values in columns.items():
+                expanded = np.full(len(index), np.nan, dtype=values.dtype)
+                expanded[positions] = values
+                columns[name] = expanded
+            present = np.zeros(len(index), dtype=bool)
+            present[positions] = self._present[metric]
+            self._present[metric] = present
+            self._first[metric] = positions[self._first[metric]]
+            self._last[metric] = positions[self._last[metric]]
+        self.index = index
+
+    def ingest(self, metric, frame):
+        # Accepts fetch_* / CandleStore frames in any order; bars already held
+        # for the same timestamp are overwritten
+        if frame is None or frame.empty:
+            return self
+        spec = METRICS[metric]
+        times = frame[spec["time"]].to_numpy().astype("datetime64[ms]", copy=False)
+        # Oldest- or newest-first frames are put in order by slicing, which
+        # keeps their columns views
+        if ascending(times):
+            order = slice(None)
+        elif ascending(times[::-1]):
+            order = slice(None, None, -1)
+        else:
+            order = np.argsort(times, kind="stable")
+        times = times[order]
+        if not len(self.index):
+            self._reindex(times)
+        elif not np.array_equal(self.index, times):
+            index = np.union1d(self.index, times)
+            if len(index) != len(self.index):
+                self._reindex(index)
+
+        columns = self.columns.setdefault(metric, {})
+        if np.array_equal(self.index, times):
+            for name in spec["columns"]:
+                columns[name] = frame[name].to_numpy()[order]
+            self._present[metric] = np.ones(len(self.index), dtype=bool)
+            positions = np.arange(len(self.index))
+        else:
+            positions = np.searchsorted(self.index, times)
+            for name in spec["columns"]:
+                values = frame[name].to_numpy()
+                if name not in columns:
+                    columns[name] = np.full(len(self.index), np.nan, dtype=values.dtype)
+                elif not columns[name].flags.owndata:
+                    columns[name] = columns[name].copy()
+                columns[name][positions] = values[order]
+            if metric not in self._present:
+                self._present[metric] = np.zeros(len(self.index), dtype=bool)
+            self._present[metric][positions] = True
+        self._first[metric] = min(
+            self._first.get(metric, len(self.index)), positions[0]
+        )
+        self._last[metric] = max(self._last.get(metric, -1), positions[-1])
+        self.version = next(_versions)
+        return self
+
+    def copy(self):
+        # Independent copy for a caller that will ingest into it, so the
+        # original (e.g. one shared across sessions) is never written through
+        series = copy.copy(self)
+        series.columns = {
+            metric: {name: values.copy() for name, values in columns.items()}
+            for metric, columns in self.columns.items()
+        }
+        series._present = {
+            metric: present.copy() for metric, present in self._present.items()
+        }
+        series._first = dict(self._first)
+        series._last = dict(self._last)
+        return series
+
+    def latest(self, metric, column):
+        return self.columns[metric][column][self._last[metric]]
+
+    def latest_time(self, metric):
+        return self.index[self._last[metric]]
+
+    def _bounds(self, metric, start, end):
+        lo, hi = self._first[metric], self._last[metric] + 1
+        if start is not None:
+            lo = max(lo, np.searchsorted(self.index, to_datetime64(start)))
+        if end is not None:
+            hi = min(hi, np.searchsorted(self.index, to_datetime64(end), side="right"))
+        return lo, hi
+
+    def frame(self, metric, start=None, end=None):
+        # Oldest bar first, time column named as in METRICS. The columns are
+        # views into the container unless other metrics have bars inside this
+        # one's span that it lacks.
+        lo, hi = self._bounds(metric, start, end)
+        data = {METRICS[metric]["time"]: self.index[lo:hi]}
+        for name, values in self.columns[metric].items():
+            data[name] = values[lo:hi]
+        frame = pd.DataFrame(data, copy=False)
+        present = self._present[metric][lo:hi]
+        return frame if present.all() else frame[present].reset_index(drop=True)